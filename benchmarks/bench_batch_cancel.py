@@ -0,0 +1,99 @@
+"""Closing a batch stream cancels its outstanding upstream calls.
+
+Streams a batch against a slow stub Perplexity, then cancels the consumer
+while every claim in the window is still waiting on the upstream (as when
+a client disconnects from /api/batch-process?stream=ndjson). One of the
+claims is also awaited by an independent caller, whose shared call must
+keep running. Counts how many analyses still completed afterwards: only
+the shared one should.
+
+Also checks that a caller arriving right after the last waiter of a call
+was cancelled gets a fresh call rather than the cancelled one.
+
+    python -m benchmarks.bench_batch_cancel --claims 16 --window 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+from contextlib import aclosing
+
+from benchmarks.stub_server import StubServer
+
+COMPLETION = {"choices": [{"message": {"content": "{}"}}]}
+
+async def check_fresh_call_after_abandon() -> bool:
+    from services.single_flight import SingleFlight
+    flight = SingleFlight()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Winding down takes a moment, like closing an HTTP connection
+            await asyncio.sleep(0.05)
+
+    async def fast():
+        return "fresh"
+
+    abandoned = asyncio.create_task(flight.do("claim", slow))
+    await asyncio.sleep(0)
+    abandoned.cancel()
+    await asyncio.gather(abandoned, return_exceptions=True)
+    try:
+        result = await flight.do("claim", fast)
+    except asyncio.CancelledError:
+        result = "cancelled"
+    print(f"new caller after the last waiter left: {result} (expected fresh)")
+    return result == "fresh"
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--claims", type=int, default=16)
+    parser.add_argument("--window", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with StubServer(lambda method, path, body: (200, COMPLETION), delay=args.delay) as stub:
+        os.environ["PERPLEXITY_BASE_URL"] = stub.url + "/chat/completions"
+        os.environ.setdefault("PERPLEXITY_API_KEY", "benchmark")
+        os.environ.setdefault("PERPLEXITY_RATE_LIMIT", "0")
+        from services.batch_processor import BatchProcessor
+        from services.journal_apis import JournalAPI
+        from services.perplexity_service import PerplexityService
+        service = PerplexityService()
+        service.cache.clear()
+        await service.start()
+        processor = BatchProcessor(service, JournalAPI(), max_in_flight=args.window)
+        claims = [f"Claim number {i} boosts metabolism" for i in range(args.claims)]
+
+        async def consume():
+            async with aclosing(processor.process_claims_stream(claims)) as records:
+                async for _ in records:
+                    pass
+
+        try:
+            consumer = asyncio.create_task(consume())
+            await asyncio.sleep(args.delay / 4)
+            shared = asyncio.create_task(service.analyze_claim(claims[0]))
+            await asyncio.sleep(args.delay / 4)
+            in_flight = service.upstream.limiter.in_flight
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+            await shared
+            await asyncio.sleep(args.delay)
+
+            completed = service.cache.stats()["size"]
+            print(f"upstream calls in flight at close: {in_flight}")
+            print(f"requests seen by the stub:        {stub.requests}")
+            print(f"analyses completed after close:   {completed} (expected 1, the shared claim)")
+            print(f"single flight: {service.inflight.stats()}")
+            print(f"still holding upstream slots:     {service.upstream.limiter.in_flight}")
+        finally:
+            await service.close()
+    fresh = await check_fresh_call_after_abandon()
+    if completed != 1 or not fresh:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
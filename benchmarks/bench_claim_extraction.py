@@ -0,0 +1,92 @@
+"""Claim extraction throughput on large synthetic transcripts.
+
+Compares ClaimExtractor with the per-sentence, per-pattern loops it
+replaced, checks that both return the same claims, and reports MB/s.
+
+    python -m benchmarks.bench_claim_extraction --words 1000,10000,100000
+"""
+import argparse
+import random
+import re
+import timeit
+
+from services.claim_extraction import ClaimExtractor
+
+FILLER = ("so anyway today we are talking about the morning routine and what I eat before the gym "
+          "and honestly it has been a long week with travel and podcasts and a new sponsor").split()
+CLAIMS = [
+    "studies show that creatine improves short term memory",
+    "cold exposure boosts dopamine by 250 percent",
+    "sugar is bad for your gut lining",
+    "daily sauna sessions can extend lifespan",
+    "taking ashwagandha enhances testosterone in men",
+    "research indicates fasting prevents insulin resistance",
+]
+
+def make_transcript(words: int, rng: random.Random) -> str:
+    parts = []
+    count = 0
+    while count < words:
+        if rng.random() < 0.15:
+            sentence = rng.choice(CLAIMS)
+        else:
+            sentence = " ".join(rng.choice(FILLER) for _ in range(rng.randint(6, 30)))
+        parts.append(sentence + rng.choice([". ", "! ", "? ", ".\n", " "]))
+        count += len(sentence.split())
+    return "".join(parts)
+
+def legacy_extract_health_claim(text: str):
+    claim_indicators = [
+        r"(studies show|research indicates|according to|proven to|may|can|will) .+",
+        r".+ (increases|decreases|improves|reduces|boosts|helps|prevents) .+",
+        r".+ is (good|bad|beneficial|harmful|effective) for .+",
+        r"(regular|daily|weekly) .+ (can|will|may) .+",
+        r"(taking|consuming|using) .+ (improves|enhances|boosts) .+"
+    ]
+    claims = []
+    for sentence in re.split(r'[.!?]+', text):
+        for pattern in claim_indicators:
+            if re.search(pattern, sentence, re.IGNORECASE):
+                claims.append(sentence.strip())
+                break
+    return claims
+
+def legacy_extract_claim_spans(text: str):
+    claims = []
+    claim_patterns = [
+        r"(studies show|research indicates|according to|proven to|can|may|will) .+",
+        r".+ (increases|decreases|improves|reduces|boosts|helps) .+",
+        r".+ is (good|bad|beneficial|harmful) for .+"
+    ]
+    for pattern in claim_patterns:
+        claims.extend(match.group(0) for match in re.finditer(pattern, text, re.IGNORECASE))
+    return claims
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    extractor = ClaimExtractor()
+    cases = [
+        ("extract_health_claim", legacy_extract_health_claim, extractor.extract_health_claims),
+        ("extract_claims spans", legacy_extract_claim_spans, extractor.extract_claim_spans),
+    ]
+    for words in [int(w) for w in args.words.split(",")]:
+        transcript = make_transcript(words, rng)
+        megabytes = len(transcript) / 1e6
+        for name, legacy, engine in cases:
+            assert legacy(transcript) == engine(transcript), f"{name} output differs"
+            old = min(timeit.repeat(lambda: legacy(transcript), number=1, repeat=args.repeat))
+            new = min(timeit.repeat(lambda: engine(transcript), number=1, repeat=args.repeat))
+            print(f"{name:<22} words={words:>7}  legacy={old * 1000:9.2f}ms ({megabytes / old:6.2f} MB/s)  "
+                  f"engine={new * 1000:9.2f}ms ({megabytes / new:6.2f} MB/s)  speedup={old / new:5.1f}x")
+
+    documents = [make_transcript(2000, rng) for _ in range(200)]
+    batch = min(timeit.repeat(lambda: extractor.extract_health_claims_many(documents), number=1, repeat=args.repeat))
+    print(f"batch of {len(documents)} x 2000-word documents: {batch * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Scaling of NearDuplicateIndex against the linear SequenceMatcher check.
+
+    python -m benchmarks.bench_dedup_index --sizes 1000,10000,100000,1000000
+
+The linear check is only timed up to --linear-max claims; its per-query cost
+grows with the store size, while the index stays roughly flat. Recall is
+measured on reworded copies of stored claims, checked against the linear
+scan's answer.
+"""
+import argparse
+import random
+import time
+from difflib import SequenceMatcher
+
+from services.dedup_index import NearDuplicateIndex
+
+VERBS = ["boosts", "reduces", "improves", "increases", "lowers", "doubles", "prevents", "halves"]
+QUALIFIERS = ["in adults", "within two weeks", "in older women", "after a month", "in athletes",
+              "when taken daily", "in clinical trials", "for most people"]
+SYLLABLES = [c + v for c in "bcdfgklmnprstv" for v in "aeiou"] + ["ing", "tion", "er", "al", "ous"]
+
+def make_vocabulary(rng: random.Random, size: int = 5000):
+    return ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+
+def make_claim(rng: random.Random, vocabulary) -> str:
+    subject = " ".join(rng.choice(vocabulary) for _ in range(2))
+    target = " ".join(rng.choice(vocabulary) for _ in range(2))
+    return f"{subject} {rng.choice(VERBS)} {target} by {rng.randint(2, 900)}% {rng.choice(QUALIFIERS)}"
+
+def reword(claim: str, rng: random.Random) -> str:
+    words = claim.split()
+    for _ in range(rng.randint(1, 2)):
+        words[rng.randrange(len(words))] = rng.choice(VERBS + ["really", "reportedly", "often"])
+    return " ".join(words)
+
+def linear_check(claim: str, existing) -> bool:
+    claim = claim.lower()
+    return any(SequenceMatcher(None, claim, other.lower()).ratio() > 0.8 for other in existing)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--linear-max", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary = make_vocabulary(rng)
+    for size in [int(s) for s in args.sizes.split(",")]:
+        claims = [make_claim(rng, vocabulary) for _ in range(size)]
+        index = NearDuplicateIndex()
+        started = time.perf_counter()
+        index.add_many(claims)
+        build = time.perf_counter() - started
+
+        queries = [reword(rng.choice(claims), rng) for _ in range(args.queries // 2)]
+        queries += [make_claim(rng, vocabulary) for _ in range(args.queries - len(queries))]
+
+        started = time.perf_counter()
+        found = [index.contains_similar(q) for q in queries]
+        indexed = (time.perf_counter() - started) / len(queries)
+
+        line = (f"n={size:>8}  build={build:7.2f}s ({size / build:8.0f}/s)  "
+                f"index query={indexed * 1000:8.3f}ms")
+        if size <= args.linear_max:
+            started = time.perf_counter()
+            expected = [linear_check(q, claims) for q in queries]
+            linear = (time.perf_counter() - started) / len(queries)
+            positives = sum(expected)
+            recall = sum(f and e for f, e in zip(found, expected)) / positives if positives else 1.0
+            false_hits = sum(f and not e for f, e in zip(found, expected))
+            line += f"  linear query={linear * 1000:9.3f}ms  recall={recall:.3f}  false_hits={false_hits}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""JournalAPI.validate_claim against local stub sources, one of them slow.
+
+PubMed answers immediately, Cochrane sleeps past its timeout and
+ScienceDirect answers with a small delay. Shows that the slow source only
+costs its own timeout until its circuit breaker opens, after which it fails
+fast, and that repeated claims are served from the caches.
+
+    python -m benchmarks.bench_journal_search --claims 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.stub_server import StubServer
+
+def pubmed(method, path, body):
+    url = urlparse(path)
+    query = parse_qs(url.query)
+    if url.path.endswith("esearch.fcgi"):
+        return 200, {"esearchresult": {"idlist": ["101", "102", "103"]}}
+    ids = query["id"][0].split(",")
+    return 200, {"result": {uid: {"title": f"A randomized controlled trial {uid}", "pubdate": "2021 Jan", "pubtype": ["Journal Article"]} for uid in ids}}
+
+def cochrane(method, path, body):
+    return 200, {"results": [{"id": "CD1", "title": "Systematic review", "year": 2020}]}
+
+def science_direct(method, path, body):
+    return 200, {"search-results": {"entry": [{"dc:title": "Meta-analysis of outcomes", "prism:coverDate": "2019-05-01"}]}}
+
+async def run(api, claims, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(claim):
+        async with semaphore:
+            started = time.perf_counter()
+            await api.validate_claim(claim)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(claim) for claim in claims])
+    return sorted(latencies), time.perf_counter() - started
+
+def report(label, latencies, elapsed):
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<12} mean={statistics.mean(latencies) * 1000:8.2f}ms p95={p95 * 1000:8.2f}ms "
+          f"throughput={len(latencies) / elapsed:8.1f}/s")
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--claims", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with StubServer(pubmed) as pubmed_stub, \
+            StubServer(cochrane, delay=2.0) as cochrane_stub, \
+            StubServer(science_direct, delay=0.05) as science_direct_stub:
+        os.environ["JOURNAL_PUBMED_BASE_URL"] = pubmed_stub.url
+        os.environ["JOURNAL_COCHRANE_BASE_URL"] = cochrane_stub.url
+        os.environ["JOURNAL_COCHRANE_TIMEOUT"] = "0.5"
+        os.environ["JOURNAL_SCIENCE_DIRECT_BASE_URL"] = science_direct_stub.url
+        os.environ.setdefault("JOURNAL_SCIENCE_DIRECT_API_KEY", "benchmark")
+        for source in ("PUBMED", "COCHRANE", "SCIENCE_DIRECT"):
+            os.environ.setdefault(f"JOURNAL_{source}_RATE_LIMIT", "0")
+        from services.journal_apis import JournalAPI
+        api = JournalAPI()
+        await api.start()
+        try:
+            claims = [f"Compound{i} supplements reduce inflammation in adults" for i in range(args.claims)]
+            latencies, elapsed = await run(api, claims, args.concurrency)
+            report("cold", latencies, elapsed)
+            latencies, elapsed = await run(api, claims, args.concurrency)
+            report("cached", latencies, elapsed)
+            print(json.dumps({name: upstream.stats() for name, upstream in api.upstreams.items()}, indent=2))
+            print(f"requests: pubmed={pubmed_stub.requests} cochrane={cochrane_stub.requests} "
+                  f"science_direct={science_direct_stub.requests}")
+        finally:
+            await api.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Per-claim latency of PerplexityService.analyze_claim with and without the shared pool.
+
+Runs against a local stub server, so it measures connection setup and client
+construction overhead only; against api.perplexity.ai the saved TLS handshake
+makes the difference larger.
+
+    python -m benchmarks.bench_perplexity_client --claims 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.stub_server import StubServer
+
+COMPLETION = {"choices": [{"message": {"content": "{}"}}]}
+
+async def run(service, claims: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await service.analyze_claim(f"Claim number {i} boosts metabolism")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(claims)])
+    return latencies, time.perf_counter() - started
+
+def report(label: str, latencies, elapsed: float, connections: int):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<16} mean={statistics.mean(latencies) * 1000:7.2f}ms "
+          f"p50={statistics.median(latencies) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms "
+          f"throughput={len(latencies) / elapsed:8.1f}/s connections={connections}")
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--claims", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    with StubServer(lambda method, path, body: (200, COMPLETION)) as stub:
+        os.environ["PERPLEXITY_BASE_URL"] = stub.url + "/chat/completions"
+        os.environ.setdefault("PERPLEXITY_API_KEY", "benchmark")
+        # Measure connection reuse, not the Upstream token bucket
+        os.environ.setdefault("PERPLEXITY_RATE_LIMIT", "0")
+        from services.perplexity_service import PerplexityService
+        service = PerplexityService()
+
+        latencies, elapsed = await run(service, args.claims, args.concurrency)
+        report("client per call", latencies, elapsed, stub.connections)
+
+        # Start from a cold analysis cache so both runs hit the stub
+        service.cache.clear()
+        stub.connections = 0
+        await service.start()
+        try:
+            latencies, elapsed = await run(service, args.claims, args.concurrency)
+            report("shared pool", latencies, elapsed, stub.connections)
+        finally:
+            await service.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+
+class StubServer:
+    """Local HTTP/1.1 keep-alive server answering every request with a JSON body.
+
+    `respond(method, path, body)` returns (status_code, payload). Used by the
+    benchmarks to stand in for Perplexity and the journal sources.
+    """
+    def __init__(self, respond: Callable[[str, str, bytes], Tuple[int, Dict]], delay: float = 0.0):
+        self.respond = respond
+        self.delay = delay
+        self.requests = 0
+        self.connections = 0
+        self.server = None
+        self.thread = None
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                stub.requests += 1
+                if stub.delay:
+                    threading.Event().wait(stub.delay)
+                status, payload = stub.respond(self.command, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (e.g. a timeout under test)
+                    pass
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
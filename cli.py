@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+from services.export import EXPORT_FORMATS, write_export
+from services.storage import SQLiteStorage
+
+def import_claims(args):
+    storage = SQLiteStorage(args.db)
+    started = time.perf_counter()
+    with (sys.stdin if args.path == "-" else open(args.path)) as lines:
+        result = storage.bulk_import_claims(lines, batch_size=args.batch_size, keep_ids=args.keep_ids)
+    storage.close()
+    elapsed = time.perf_counter() - started
+    print(f"Imported {result['imported']} claims ({result['skipped']} skipped, "
+          f"{result['conflicts']} conflicting ids left out) in {elapsed:.1f}s "
+          f"({result['imported'] / elapsed if elapsed else 0:.0f} rows/sec)", file=sys.stderr)
+
+def export_claims(args):
+    if args.format == "parquet" and args.path == "-":
+        sys.exit("Parquet export needs a file path")
+    storage = SQLiteStorage(args.db)
+    categories = args.category.split(",") if args.category else None
+    chunks = storage.iter_claim_chunks(args.date_from, args.date_to, categories, chunk_size=args.chunk_size)
+    try:
+        progress = write_export(chunks, args.format, args.path)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    finally:
+        storage.close()
+    print(progress.report(args.format), file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Health claims data tools")
+    parser.add_argument("--db", default=os.getenv("STORAGE_PATH", "claims.db"), help="SQLite database path (STORAGE_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import-claims", help="Bulk load claims from a JSONL file")
+    importer.add_argument("path", help="JSONL file, or - for stdin")
+    importer.add_argument("--batch-size", type=int, default=50000)
+    importer.add_argument("--keep-ids", action="store_true",
+                          help="Keep the file's claim ids instead of assigning new ones; already stored ids are left out")
+    importer.set_defaults(handler=import_claims)
+
+    exporter = commands.add_parser("export-claims", help="Stream claims to NDJSON, CSV or Parquet")
+    exporter.add_argument("path", help="Output file, or - for stdout (NDJSON/CSV only)")
+    exporter.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", help="parquet needs pyarrow")
+    exporter.add_argument("--date-from", help="Earliest claim date (ISO)")
+    exporter.add_argument("--date-to", help="Latest claim date (ISO, inclusive)")
+    exporter.add_argument("--category", help="Only these categories, comma-separated")
+    exporter.add_argument("--chunk-size", type=int, default=10000)
+    exporter.set_defaults(handler=export_claims)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
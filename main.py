@@ -1,16 +1,38 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+import asyncio
+import json
+from contextlib import aclosing
+import os
 import random
+import time
 from datetime import datetime
 import re
 from difflib import SequenceMatcher
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 from services.perplexity_service import PerplexityService
-from services.social_media import TwitterAPI, YouTubeAPI
+from services.social_media import get_twitter_api, get_youtube_api, twitter_executor, youtube_executor
 from services.journal_apis import JournalAPI
 from services.batch_processor import BatchProcessor
 from services.analytics_service import AnalyticsService
+from services.dedup_index import NearDuplicateIndex
+from services.vector_index import VectorIndex
+from services.claim_store import CLAIM_SORTS, ClaimRepository
+from services.leaderboard import Leaderboard
+from services.storage import CLAIM_COLUMNS, IdAllocator, storage_from_env, to_row
+from services.jobs import Job, JobQueue
+from services.scan_scheduler import ScanScheduler, posts_report
+from services.loop_monitor import LoopLagMonitor
+from services.response_cache import DataVersion, ResponseCache
+from services.rollups import hour_of
+from services.export import MEDIA_TYPES, stream_export
+from services.pagination import MAX_PAGE_SIZE, OrderedIndex, decode_cursor, id_key, page_response, parse_fields
 
 app = FastAPI()
 
@@ -24,7 +46,19 @@ app.add_middleware(
 )
 
 influencers = {}
-claims = {}
+influencer_index = OrderedIndex()
+claims = ClaimRepository()
+leaderboard = Leaderboard()
+storage = storage_from_env()
+storage_flusher = None
+periodic_sweeper = None
+loop_monitor = LoopLagMonitor(interval=float(os.getenv("LOOP_LAG_INTERVAL", "0.1")))
+jobs = JobQueue.from_env(default_path=getattr(storage, "path", ":memory:"))
+SEEN_POSTS_LIMIT = int(os.getenv("SEEN_POSTS_LIMIT", "1000"))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))
+scan_scheduler = ScanScheduler(lambda influencer_id: run_scan(influencer_id), influencers, storage)
+claim_ids = IdAllocator(storage, "claims")
+influencer_ids = IdAllocator(storage, "influencers", block_size=10)
 
 class Claim(BaseModel):
     id: str
@@ -54,6 +88,44 @@ ai_service = PerplexityService()
 journal_api = JournalAPI()
 batch_processor = BatchProcessor(ai_service, journal_api)
 analytics_service = AnalyticsService()
+claims.subscribe(analytics_service.on_claim_event)
+data_version = DataVersion()
+claims.subscribe(data_version.on_claim_event)
+response_cache = ResponseCache()
+index_locks = []
+
+def index_path(env: str, suffix: str) -> Optional[str]:
+    """Where a claim index persists: `env`, else next to the SQLite database.
+
+    Memory-only storage restarts claim ids at 1, so a persisted index would
+    hold entries for claims that no longer exist under reused ids; the
+    indexes then stay in memory too.
+
+    The index files are appended without coordination, so only one process
+    may own them: the first worker takes an exclusive lock on `<path>.lock`
+    for its lifetime, and any other worker sharing the database keeps its
+    index in memory (rebuilt from storage on warm start).
+    """
+    storage_path = getattr(storage, "path", None)
+    if not storage_path or storage_path == ":memory:":
+        if os.getenv(env):
+            print(f"Warning: {env} ignored because claims are not persisted (STORAGE_BACKEND=memory)")
+        return None
+    path = os.getenv(env) or f"{storage_path}.{suffix}"
+    if fcntl is None:
+        return path
+    lock = open(f"{path}.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        print(f"Warning: {path} is owned by another worker; keeping this worker's index in memory")
+        return None
+    index_locks.append(lock)
+    return path
+
+duplicate_index = NearDuplicateIndex(path=index_path("DEDUP_INDEX_PATH", "dedup"))
+vector_index = VectorIndex(path=index_path("VECTOR_INDEX_PATH", "vectors"))
 
 research_config = ResearchConfig(
     date_range="30d",
@@ -63,6 +135,95 @@ research_config = ResearchConfig(
     categories=["Nutrition", "Medicine", "Mental Health", "Fitness", "Alternative Medicine"]
 )
 
+def save_influencer(influencer: Influencer, persist: bool = True):
+    influencers[influencer.id] = influencer
+    influencer_index.add(id_key(influencer.id))
+    leaderboard.upsert(influencer)
+    data_version.bump_influencer(influencer.id)
+    if persist:
+        storage.save_influencer(to_row(influencer))
+
+def persist_claim(event: str, claim: Claim, previous: Optional[Claim]):
+    """Write-through from the in-memory claim store to durable storage"""
+    if event == "remove":
+        storage.delete_claim(claim.id)
+    else:
+        storage.save_claims([to_row(claim)])
+
+def index_claims(new_claims: List[Claim]):
+    """Add stored claims to the near-duplicate and semantic indexes"""
+    for claim in new_claims:
+        duplicate_index.add(claim.content)
+    unindexed = [c for c in new_claims if c.id not in vector_index]
+    if not unindexed:
+        return
+    embeddings = ai_service.embeddings.encode([c.content for c in unindexed])
+    if embeddings is not None:
+        vector_index.add_many([c.id for c in unindexed], embeddings)
+
+def load_from_storage(chunk_size: int = 5000):
+    """Warm start: stream stored rows into memory instead of re-analyzing"""
+    for row in storage.iter_influencers():
+        save_influencer(Influencer(**row), persist=False)
+
+    chunk = []
+    for row in storage.iter_claims():
+        claim = Claim(**row)
+        claims.add(claim)
+        chunk.append(claim)
+        if len(chunk) >= chunk_size:
+            index_claims(chunk)
+            chunk = []
+    if chunk:
+        index_claims(chunk)
+
+async def flush_storage_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            storage.flush()
+        except Exception as e:
+            print(f"Storage flush error: {str(e)}")
+
+def is_known_claim(text: str, embedding=None) -> bool:
+    """True if a stored claim is a textual or semantic duplicate of `text`"""
+    if duplicate_index.contains_similar(text):
+        return True
+    if embedding is not None:
+        nearest = vector_index.search(embedding, k=1)
+        return bool(nearest) and nearest[0][1] > 0.85
+    return False
+
+def commit_claims(influencer_id: str, source: str, analyzed: List, dedupe: bool = True) -> List[Claim]:
+    """Store analyzed claims as one batch and return the ones kept.
+
+    `analyzed` holds (content, analysis, embedding) tuples. This function
+    never awaits, so concurrent scans cannot interleave between the
+    duplicate re-check, id allocation and insert; claims another scan
+    committed while this one was waiting on upstream calls are dropped here.
+    """
+    new_claims = []
+    for content, analysis, embedding in analyzed:
+        if dedupe and is_known_claim(content, embedding):
+            continue
+        claim = Claim(
+            id=claim_ids.next_id(),
+            influencer_id=influencer_id,
+            content=content,
+            category=analysis["category"],
+            verification_status=analysis["verification_status"],
+            trust_score=analysis["trust_score"],
+            source=source,
+            date=datetime.now().isoformat()
+        )
+        # Index right away so later items in the same batch see it
+        index_claims([claim])
+        new_claims.append(claim)
+
+    claims.add_many(new_claims)
+    storage.flush()
+    return new_claims
+
 def init_sample_data():
     sample_influencers = [
         {"name": "HealthGuru", "platform": "Instagram", "bio": "Evidence-based nutrition advice"},
@@ -74,13 +235,13 @@ def init_sample_data():
     
     for inf in sample_influencers:
         influencer = Influencer(
-            id=str(len(influencers) + 1),
+            id=influencer_ids.next_id(),
             name=inf["name"],
             follower_count=random.randint(10000, 1000000),
             trust_score=random.uniform(60, 95),
             platform=inf["platform"]
         )
-        influencers[influencer.id] = influencer
+        save_influencer(influencer)
         
         sample_claims = [
             "Regular consumption of green tea can boost metabolism by up to 4%",
@@ -90,40 +251,103 @@ def init_sample_data():
             "Omega-3 supplements can improve memory function by 15%"
         ]
         
-        for claim_text in sample_claims:
-            analysis = ai_service.analyze_text(claim_text)
-            claim = Claim(
-                id=str(len(claims) + 1),
-                influencer_id=influencer.id,
-                content=claim_text,
-                category=analysis["category"],
-                verification_status=analysis["verification_status"],
-                trust_score=analysis["trust_score"],
-                source="Sample Data",
-                date=datetime.now().isoformat()
-            )
-            claims[claim.id] = claim
+        analyses = ai_service.analyze_text_batch(sample_claims)
+        commit_claims(
+            influencer.id,
+            "Sample Data",
+            [(text, analysis, None) for text, analysis in zip(sample_claims, analyses)],
+            dedupe=False
+        )
 
 @app.on_event("startup")
 async def startup_event():
-    init_sample_data()
+    global storage_flusher, periodic_sweeper
+    loop_monitor.start()
+    await ai_service.start()
+    await journal_api.start()
+    load_from_storage()
+    claims.subscribe(persist_claim)
+    if not influencers:
+        init_sample_data()
+    storage_flusher = asyncio.create_task(
+        flush_storage_periodically(float(os.getenv("STORAGE_FLUSH_INTERVAL", "1.0")))
+    )
+    await jobs.start()
+    scan_scheduler.load()
+    await scan_scheduler.start()
+    sweep_interval = float(os.getenv("SCAN_SWEEP_INTERVAL", "0"))
+    if sweep_interval > 0:
+        periodic_sweeper = asyncio.create_task(scan_scheduler.run_periodic(
+            sweep_interval,
+            max_age=float(os.getenv("SCAN_SWEEP_MAX_AGE", str(sweep_interval)))
+        ))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    loop_monitor.stop()
+    if periodic_sweeper:
+        periodic_sweeper.cancel()
+    await scan_scheduler.close()
+    await jobs.close()
+    # No scans are left to call the SDKs: drop queued calls, let running ones finish
+    twitter_executor.close()
+    youtube_executor.close()
+    storage_flusher.cancel()
+    storage.close()
+    await ai_service.close()
+    await journal_api.close()
+    duplicate_index.close()
+    vector_index.close()
+    for lock in index_locks:
+        lock.close()
 
 @app.post("/api/influencers")
 async def add_influencer(name: str, platform: str):
-    influencer_id = str(len(influencers) + 1)
     influencer = Influencer(
-        id=influencer_id,
+        id=influencer_ids.next_id(),
         name=name,
         follower_count=random.randint(1000, 1000000),
         trust_score=random.uniform(0, 100),
         platform=platform
     )
-    influencers[influencer_id] = influencer
+    save_influencer(influencer)
     return influencer
 
+DEFAULT_PAGE_SIZE = 50
+
+def page_size(limit: Optional[int]) -> int:
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
 @app.get("/api/influencers")
-async def get_influencers():
-    return list(influencers.values())
+async def get_influencers(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[str] = None,
+    platform: Optional[str] = None,
+    min_trust_score: Optional[float] = None
+):
+    """All influencers, or one page of them by id when any paging/filter param is given"""
+    if cursor is None and limit is None and fields is None and platform is None and min_trust_score is None:
+        return list(influencers.values())
+    try:
+        after = decode_cursor(cursor, "id")
+        projection = parse_fields(fields, Influencer.__annotations__)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    size = page_size(limit)
+    items, last_key = [], None
+    for key in influencer_index.walk(after):
+        influencer = influencers[key[-1]]
+        if platform and influencer.platform.lower() != platform.lower():
+            continue
+        if min_trust_score is not None and influencer.trust_score < min_trust_score:
+            continue
+        items.append(influencer)
+        if len(items) >= size:
+            last_key = key
+            break
+    return page_response(items, projection, "id", last_key)
 
 @app.get("/api/influencers/{influencer_id}")
 async def get_influencer(influencer_id: str):
@@ -138,136 +362,390 @@ async def add_claim(influencer_id: str, content: str):
     
     analysis = await ai_service.analyze_claim(content)  
     
-    claim_id = str(len(claims) + 1)
-    claim = Claim(
-        id=claim_id,
-        influencer_id=influencer_id,
-        content=content,
-        category=analysis["category"],
-        verification_status=analysis["verification_status"],
-        trust_score=analysis["trust_score"],
-        source="Perplexity Analysis",
-        date=datetime.now().isoformat()
+    return commit_claims(influencer_id, "Perplexity Analysis", [(content, analysis, None)], dedupe=False)[0]
+
+def claims_page(
+    influencer_id: str,
+    cursor: Optional[str],
+    limit: Optional[int],
+    sort: str,
+    fields: Optional[str],
+    category: Optional[str],
+    status: Optional[str],
+    min_trust_score: Optional[float],
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> Dict:
+    """One page of an influencer's claims as {"items", "next_cursor"}"""
+    if sort not in CLAIM_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(CLAIM_SORTS)}")
+    try:
+        after = decode_cursor(cursor, sort)
+        projection = parse_fields(fields, Claim.__annotations__)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def match(claim: Claim) -> bool:
+        return (
+            (category is None or claim.category == category)
+            and (status is None or claim.verification_status == status)
+            and (min_trust_score is None or claim.trust_score >= min_trust_score)
+        )
+
+    items, last_key = claims.page(
+        influencer_id, sort=sort, after=after, limit=page_size(limit),
+        match=match, date_from=date_from, date_to=date_to
     )
-    claims[claim_id] = claim
-    return claim
+    return page_response(items, projection, sort, last_key)
+
+def is_paged(*params) -> bool:
+    return any(param is not None for param in params)
 
 @app.get("/api/claims/{influencer_id}")
-async def get_claims(influencer_id: str):
-    return [claim for claim in claims.values() if claim.influencer_id == influencer_id]
+async def get_claims(
+    influencer_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    min_trust_score: Optional[float] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+):
+    """All of an influencer's claims, or one page of them when any paging/filter param is given"""
+    params = (cursor, limit, sort, fields, category, status, min_trust_score, date_from, date_to)
+    if not is_paged(*params):
+        return claims.by_influencer(influencer_id)
+    return claims_page(influencer_id, cursor, limit, sort or "id", *params[3:])
+
+@app.get("/api/claims/{claim_id}/related")
+async def get_related_claims(claim_id: str, k: int = 10):
+    """Nearest stored claims by embedding similarity"""
+    if claim_id not in claims:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    if claim_id not in vector_index:
+        embedding = ai_service.embeddings.encode([claims[claim_id].content])
+        if embedding is None:
+            raise HTTPException(status_code=503, detail="Semantic search unavailable: sentence-transformers not installed")
+        vector_index.add(claim_id, embedding[0])
+
+    return [
+        {"claim": claims[related_id], "similarity": similarity}
+        for related_id, similarity in vector_index.neighbours(claim_id, k)
+        if related_id in claims
+    ]
 
 @app.get("/api/analyze")
 async def analyze_content(content: str):
     return ai_service.analyze_text(content)
 
+def window_summary(window: str):
+    try:
+        return analytics_service.summary(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def window_version(window: str):
+    """Data version a windowed response was built at; windows also slide every hour"""
+    return data_version.get() if window == "all" else (data_version.get(), hour_of(datetime.now()))
+
 @app.get("/api/stats")
-async def get_stats():
-    total_claims = len(claims)
-    verified_claims = len([c for c in claims.values() if c.verification_status == "Verified"])
-    avg_trust_score = sum(c.trust_score for c in claims.values()) / (total_claims if total_claims > 0 else 1)
-    
+async def get_stats(request: Request, window: str = "all"):
+    """Claim totals, over all time or one of AnalyticsService.time_periods"""
+    return response_cache.respond(
+        ("stats", window), window_version(window), lambda: build_stats(window), request.headers.get("if-none-match")
+    )
+
+def build_stats(window: str) -> Dict:
+    summary = window_summary(window)
+    if summary is not None:
+        count, verified, trust_sum, _ = summary.totals
+        return {
+            "total_influencers": len(influencers),
+            "total_claims": int(count),
+            "verified_claims": int(verified),
+            "avg_trust_score": trust_sum / count if count else 0,
+            "categories": {cat: int(summary.categories.get(cat, [0])[0]) for cat in ai_service.keywords.keys()},
+            "window": window
+        }
     return {
         "total_influencers": len(influencers),
-        "total_claims": total_claims,
-        "verified_claims": verified_claims,
-        "avg_trust_score": avg_trust_score,
-        "categories": {cat: len([c for c in claims.values() if c.category == cat]) 
-                      for cat in ai_service.keywords.keys()}
+        "total_claims": claims.totals.count,
+        "verified_claims": claims.totals.verified,
+        "avg_trust_score": claims.totals.avg_trust_score,
+        "categories": {cat: claims.category_stats(cat).count for cat in ai_service.keywords.keys()}
     }
 
-@app.post("/api/influencers/{influencer_id}/scan")
-async def scan_influencer_content(influencer_id: str):
-    """Scan influencer's social media for new claims"""
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    return {
+        "perplexity": {**ai_service.cache.stats(), "single_flight": ai_service.inflight.stats()},
+        "journal": {**journal_api.cache.stats(), "single_flight": journal_api.inflight.stats()},
+        "journal_search": journal_api.search_cache.stats(),
+        "responses": response_cache.stats(),
+        "embeddings": ai_service.embeddings.stats()
+    }
+
+@app.get("/api/health/loop-lag")
+async def get_loop_lag():
+    """Event loop lag, plus the thread pools that keep blocking SDK calls off the loop"""
+    return {
+        "loop": loop_monitor.stats(),
+        "executors": {executor.name: executor.stats() for executor in (twitter_executor, youtube_executor)}
+    }
+
+@app.get("/api/upstreams/stats")
+async def get_upstream_stats():
+    """Current rate and adaptive concurrency limits per upstream"""
+    upstreams = [ai_service.upstream, *journal_api.upstreams.values()]
+    return {upstream.name: upstream.stats() for upstream in upstreams}
+
+async def analyze_checkpointed(claim: str, job: Optional[Job] = None) -> Dict:
+    """analyze_claim, remembering results in the job checkpoint so a resumed job skips them"""
+    if job is None:
+        return await ai_service.analyze_claim(claim)
+    done = job.checkpoint.setdefault("analyses", {})
+    if claim not in done:
+        done[claim] = await ai_service.analyze_claim(claim)
+        job.save_checkpoint()
+    return done[claim]
+
+async def run_scan(influencer_id: str, job: Optional[Job] = None) -> Dict:
     if influencer_id not in influencers:
         raise HTTPException(status_code=404, detail="Influencer not found")
     
     influencer = influencers[influencer_id]
     
-    try:
-        content = []
-        if influencer.platform.lower() == "twitter":
-            twitter_api = TwitterAPI()
-            tweets = await twitter_api.fetch_recent_posts(influencer.name)
-            content.extend(tweets)
-        elif influencer.platform.lower() == "youtube":
-            youtube_api = YouTubeAPI()
-            descriptions = await youtube_api.fetch_recent_posts(influencer.name)
-            content.extend(descriptions)
-        else:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported platform: {influencer.platform}"
-            )
-
-        if not content:
-            return {"message": "No content found", "claims": []}
-
-        new_claims = []
-        existing_claim_contents = [c.content for c in claims.values()]  # Get existing claim contents
+    if influencer.platform.lower() == "twitter":
+        api = get_twitter_api()
+    elif influencer.platform.lower() == "youtube":
+        api = get_youtube_api()
+    else:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported platform: {influencer.platform}"
+        )
+
+    # Only ask for posts past the high-water mark, then drop any we already processed
+    state = scan_scheduler.state(influencer_id)
+    posts, cursor, filtered = await api.fetch_new_posts(influencer.name, state.get("cursor"))
+    seen = state.get("seen_posts", [])
+    seen_ids = set(seen)
+    new_posts = [post for post in posts if post["id"] is None or post["id"] not in seen_ids]
+    # Posts the API returned but the cursor filtered out were processed on an earlier scan
+    report = posts_report(len(new_posts), len(posts) - len(new_posts) + filtered)
+    content = [post["text"] for post in new_posts]
+
+    def record_progress():
+        # Only after the claims are stored, so a failed scan retries the same posts
+        seen_posts = seen + [post["id"] for post in new_posts if post["id"] is not None]
+        scan_scheduler.update_state(
+            influencer_id,
+            cursor=cursor,
+            seen_posts=seen_posts[-SEEN_POSTS_LIMIT:],
+            last_scanned_at=time.time()
+        )
+
+    if not content:
+        record_progress()
+        return {"message": "No content found", "claims": [], "posts": report}
+
+    analyzed = []
+    pending = []
+    
+    for extracted_claims in ai_service.extract_health_claims_batch(content):
+        embeddings = ai_service.embeddings.encode(extracted_claims) if extracted_claims else None
         
-        for text in content:
-            extracted_claims = ai_service.extract_health_claim(text)
+        for i, claim in enumerate(extracted_claims):
+            embedding = embeddings[i] if embeddings is not None else None
+            if is_known_claim(claim, embedding) or ai_service.check_duplicate(claim, pending):
+                continue
+            pending.append(claim)
+            analysis = await analyze_checkpointed(claim, job)
             
-            for claim in extracted_claims:
-                if not ai_service.check_duplicate(claim, existing_claim_contents):
-                    analysis = await ai_service.analyze_claim(claim)
-                    
-                    if analysis["trust_score"] > 0: 
-                        claim_obj = Claim(
-                            id=str(len(claims) + 1),
-                            influencer_id=influencer_id,
-                            content=claim,
-                            category=analysis["category"],
-                            verification_status=analysis["verification_status"],
-                            trust_score=analysis["trust_score"],
-                            source=f"{influencer.platform} Scan",
-                            date=datetime.now().isoformat()
-                        )
-                        claims[claim_obj.id] = claim_obj
-                        new_claims.append(claim_obj)
-        
-        return {"message": f"Found {len(new_claims)} new claims", "claims": new_claims}
+            if analysis["trust_score"] > 0: 
+                analyzed.append((claim, analysis, embedding))
+    
+    new_claims = commit_claims(influencer_id, f"{influencer.platform} Scan", analyzed)
+    record_progress()
+    return {"message": f"Found {len(new_claims)} new claims", "claims": new_claims, "posts": report}
+
+@app.post("/api/influencers/{influencer_id}/scan")
+async def scan_influencer_content(influencer_id: str, background: bool = False):
+    """Scan influencer's social media for new claims"""
+    if influencer_id not in influencers:
+        raise HTTPException(status_code=404, detail="Influencer not found")
+    if background:
+        return jobs.submit("scan", {"influencer_id": influencer_id}).to_dict()
+    
+    try:
+        return await run_scan(influencer_id)
     except Exception as e:
         print(f"Scan error: {str(e)}")  
         raise HTTPException(status_code=500, detail=str(e))
 
+async def run_batch(job: Job) -> Dict:
+    """Batch job; finished results are checkpointed by index and skipped on resume"""
+    batch = job.params["claims"]
+    results = job.checkpoint.setdefault("results", {})
+    todo = [i for i in range(len(batch)) if str(i) not in results]
+    errors = []
+    async for record in batch_processor.process_claims_stream([batch[i] for i in todo]):
+        if record["type"] == "result":
+            results[str(todo[record["index"]])] = record["result"]
+            job.save_checkpoint()
+        elif record["type"] == "error":
+            errors.append({"index": todo[record["index"]], "claim": record["claim"], "error": record["error"]})
+    ordered = [results[str(i)] for i in range(len(batch)) if str(i) in results]
+    return {"processed": len(ordered), "results": ordered, "errors": errors}
+
+@app.post("/api/scans/sweep")
+async def sweep_influencers(
+    influencer_ids: Optional[List[str]] = None,
+    platform: Optional[str] = None,
+    max_age: float = 0
+):
+    """Queue many (by default all) influencers for scanning"""
+    return scan_scheduler.sweep(influencer_ids, platform, max_age)
+
+@app.get("/api/scans/status")
+async def get_scan_status():
+    return scan_scheduler.stats()
+
+@app.get("/api/influencers/{influencer_id}/scan-state")
+async def get_scan_state(influencer_id: str):
+    if influencer_id not in influencers:
+        raise HTTPException(status_code=404, detail="Influencer not found")
+    return scan_scheduler.state(influencer_id)
+
 @app.post("/api/batch-process")
-async def process_claims_batch(claims: List[str]):
-    results = await batch_processor.process_claims(claims)
-    return {"processed": len(results), "results": results}
+async def process_claims_batch(claims: List[str], stream: Optional[str] = None, background: bool = False):
+    """Process claims; with stream=ndjson or stream=sse, send records as claims complete"""
+    if background:
+        return jobs.submit("batch", {"claims": claims}).to_dict()
+    if stream is None:
+        results = await batch_processor.process_claims(claims)
+        return {"processed": len(results), "results": results}
+    if stream not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="stream must be 'ndjson' or 'sse'")
 
-@app.get("/api/analytics/report")
-async def get_analytics_report():
-    return analytics_service.generate_report(
-        claims=list(claims.values()),
-        influencers=list(influencers.values())
+    async def body():
+        # Starlette cancels this generator when the client disconnects, which
+        # closes process_claims_stream and cancels the claims still in flight,
+        # along with their upstream calls unless another request shares them
+        async with aclosing(batch_processor.process_claims_stream(claims)) as records:
+            async for record in records:
+                line = json.dumps(record, default=str)
+                yield f"event: {record['type']}\ndata: {line}\n\n" if stream == "sse" else line + "\n"
+
+    media_type = "text/event-stream" if stream == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+def claim_chunks(date_from: Optional[str], date_to: Optional[str], categories: Optional[List[str]]):
+    """Claims as CLAIM_COLUMNS tuples in chunks, read from storage when it persists them"""
+    if getattr(storage, "path", None):
+        return storage.iter_claim_chunks(date_from, date_to, categories, chunk_size=EXPORT_CHUNK_SIZE)
+
+    def from_memory():
+        # Resume from the last id after each chunk, like fetchmany on the SQLite path
+        after = None
+        while True:
+            batch, after = claims.scan(after, EXPORT_CHUNK_SIZE)
+            chunk = [
+                tuple(getattr(claim, column) for column in CLAIM_COLUMNS)
+                for claim in batch
+                if not (categories and claim.category not in categories)
+                and not (date_from and claim.date < date_from)
+                and not (date_to and claim.date[:len(date_to)] > date_to)
+            ]
+            if chunk:
+                yield chunk
+            if after is None:
+                return
+    return from_memory()
+
+@app.get("/api/export/claims")
+async def export_claims(
+    format: str = "ndjson",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    category: Optional[str] = None
+):
+    """Stream every matching claim as NDJSON or CSV; `category` may be comma-separated.
+
+    Rows are read and encoded a chunk at a time, so memory use does not
+    grow with the corpus. Parquet is available through `cli.py export-claims`.
+    """
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(MEDIA_TYPES)}")
+    categories = [name.strip() for name in category.split(",")] if category else None
+
+    def report(progress):
+        print(progress.report(format))
+
+    # A plain generator: Starlette iterates it in its threadpool, off the event loop
+    body = stream_export(claim_chunks(date_from, date_to, categories), format, on_done=report)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=claims.{format}"}
     )
 
+@app.get("/api/analytics/report")
+async def get_analytics_report(request: Request, window: str = "all"):
+    def build():
+        try:
+            return analytics_service.generate_report(influencers=list(influencers.values()), window=window)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return response_cache.respond(("report", window), window_version(window), build, request.headers.get("if-none-match"))
+
 @app.get("/api/dashboard/leaderboard")
-async def get_leaderboard():
+async def get_leaderboard(
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)
+):
     """Get influencer leaderboard"""
-    return sorted(
-        list(influencers.values()),
-        key=lambda x: x.trust_score,
-        reverse=True
+    # Rankings only depend on influencer scores, so claim inserts leave the cache valid
+    return response_cache.respond(
+        ("leaderboard", offset, limit), data_version.influencer_version, lambda: leaderboard.top(offset, limit),
+        request.headers.get("if-none-match")
     )
 
 @app.get("/api/dashboard/influencer/{influencer_id}")
-async def get_influencer_dashboard(influencer_id: str):
-    """Get influencer detail page data"""
+async def get_influencer_dashboard(
+    request: Request,
+    influencer_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    min_trust_score: Optional[float] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+):
+    """Get influencer detail page data; paging/filter params page through the claims"""
     influencer = influencers.get(influencer_id)
     if not influencer:
         raise HTTPException(status_code=404, detail="Influencer not found")
-        
-    return {
-        "influencer": influencer,
-        "claims": [c for c in claims.values() if c.influencer_id == influencer_id],
-        "stats": {
-            "total_claims": len([c for c in claims.values() if c.influencer_id == influencer_id]),
-            "verified_claims": len([c for c in claims.values() if c.influencer_id == influencer_id and c.verification_status == "Verified"]),
-            "avg_trust_score": sum(c.trust_score for c in claims.values() if c.influencer_id == influencer_id) / len([c for c in claims.values() if c.influencer_id == influencer_id]) if len([c for c in claims.values() if c.influencer_id == influencer_id]) > 0 else 0
-        }
-    }
+    params = (cursor, limit, sort, fields, category, status, min_trust_score, date_from, date_to)
+
+    def build():
+        stats = claims.influencer_stats(influencer_id).to_dict()
+        if not is_paged(*params):
+            return {"influencer": influencer, "claims": claims.by_influencer(influencer_id), "stats": stats}
+        page = claims_page(influencer_id, cursor, limit, sort or "id", *params[3:])
+        return {"influencer": influencer, "claims": page["items"], "next_cursor": page["next_cursor"], "stats": stats}
+
+    return response_cache.respond(
+        ("dashboard", influencer_id, params), data_version.get(influencer_id), build, request.headers.get("if-none-match")
+    )
 
 @app.post("/api/dashboard/config")
 async def set_research_config(config: Dict):
@@ -291,45 +769,27 @@ async def get_influencer_analysis(influencer_id: str):
         raise HTTPException(status_code=404, detail="Influencer not found")
         
     influencer = influencers[influencer_id]
-    influencer_claims = [c for c in claims.values() if c.influencer_id == influencer_id]
-    
-    categories = {}
-    verification_status = {"Verified": 0, "Questionable": 0, "Debunked": 0}
-    total_trust_score = 0
-    
-    for claim in influencer_claims:
-        categories[claim.category] = categories.get(claim.category, 0) + 1
-        verification_status[claim.verification_status] = verification_status.get(claim.verification_status, 0) + 1
-        total_trust_score += claim.trust_score
-    
-    avg_trust_score = total_trust_score / len(influencer_claims) if influencer_claims else 0
+    stats = claims.influencer_stats(influencer_id)
     
     return {
         "influencer": influencer,
-        "total_claims": len(influencer_claims),
-        "categories": categories,
-        "verification_status": verification_status,
-        "avg_trust_score": avg_trust_score,
-        "recent_claims": influencer_claims[-5:], 
+        "total_claims": stats.count,
+        "categories": dict(stats.categories),
+        "verification_status": {"Verified": 0, "Questionable": 0, "Debunked": 0, **stats.statuses},
+        "avg_trust_score": stats.avg_trust_score,
+        "recent_claims": claims.recent_by_influencer(influencer_id, 5), 
         "analysis_date": datetime.now().isoformat()
     }
 
-@app.post("/api/influencers/{influencer_id}/analyze")
-async def analyze_influencer(
-    influencer_id: str,
-    full_scan: bool = False,
-    config: Optional[ResearchConfig] = None
-):
-    """Comprehensive influencer analysis"""
+async def run_analysis(influencer_id: str, config: ResearchConfig, job: Optional[Job] = None) -> Dict:
     if influencer_id not in influencers:
         raise HTTPException(status_code=404, detail="Influencer not found")
         
-    config = config or research_config
     influencer = influencers[influencer_id]
     
     content = []
     if influencer.platform.lower() == "twitter":
-        twitter_api = TwitterAPI()
+        twitter_api = get_twitter_api()
         tweets = await twitter_api.fetch_recent_posts(influencer.name)
         content.extend(tweets)
         
@@ -338,7 +798,7 @@ async def analyze_influencer(
         extracted_claims = ai_service.extract_health_claim(text)
         for claim in extracted_claims:
             if not ai_service.check_duplicate(claim, [c.content for c in claims]):
-                analysis = await ai_service.analyze_claim(claim)
+                analysis = await analyze_checkpointed(claim, job)
                 if analysis["trust_score"] >= config.min_trust_score:
                     claims.append(Claim(
                         id=str(len(claims) + 1),
@@ -363,6 +823,52 @@ async def analyze_influencer(
         }
     }
 
+@app.post("/api/influencers/{influencer_id}/analyze")
+async def analyze_influencer(
+    influencer_id: str,
+    full_scan: bool = False,
+    config: Optional[ResearchConfig] = None,
+    background: bool = False
+):
+    """Comprehensive influencer analysis"""
+    if influencer_id not in influencers:
+        raise HTTPException(status_code=404, detail="Influencer not found")
+        
+    config = config or research_config
+    if background:
+        return jobs.submit("analyze", {"influencer_id": influencer_id, "config": to_row(config)}).to_dict()
+    return await run_analysis(influencer_id, config)
+
+@app.get("/api/jobs")
+async def list_jobs(status: Optional[str] = None, kind: Optional[str] = None, limit: int = 100):
+    return [job.to_dict(include_result=False) for job in jobs.list(status, kind, limit)]
+
+@app.get("/api/jobs/stats")
+async def get_job_stats():
+    return jobs.stats()
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    job = jobs.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict(include_result=False)
+
+jobs.register("scan", lambda job: run_scan(job.params["influencer_id"], job), concurrency=2)
+jobs.register(
+    "analyze",
+    lambda job: run_analysis(job.params["influencer_id"], ResearchConfig(**job.params["config"]), job),
+    concurrency=2
+)
+jobs.register("batch", run_batch, concurrency=1)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,39 +1,296 @@
-from typing import List, Dict
-from datetime import datetime, timedelta
-import pandas as pd
+from typing import Callable, List, Dict, Optional
+from datetime import date
+import os
 import numpy as np
+from services.rollups import WINDOWS, Rollups, RollupSummary, parse_window
+
+TRUST_BINS = 10
+
+def _day(value: str) -> Optional[int]:
+    """Proleptic ordinal of an ISO date/datetime string, or None if unparseable"""
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except (TypeError, ValueError):
+        return None
 
 class AnalyticsService:
-    def __init__(self):
-        self.time_periods = ["24h", "7d", "30d", "all"]
+    """Columnar analytics over every stored claim, updated as claims change.
+
+    Claims live in preallocated NumPy columns (day, trust score, verified,
+    category and influencer codes) that grow by doubling. Alongside them the
+    service keeps running aggregates per day, category and influencer plus a
+    trust-score histogram, so `generate_report` costs O(days + categories +
+    influencers) rather than O(claims). Reports over a time window ("24h",
+    "7d", "30d") come from hourly/daily `Rollups` kept alongside.
+
+    Feed it through `ClaimRepository.subscribe(analytics.on_claim_event)`.
+    """
+    def __init__(self, capacity: int = 1024):
+        self.time_periods = list(WINDOWS)
+
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._day = np.zeros(capacity, dtype=np.int32)
+        self._trust = np.zeros(capacity, dtype=np.float32)
+        self._verified = np.zeros(capacity, dtype=bool)
+        self._category = np.zeros(capacity, dtype=np.int16)
+        self._influencer = np.zeros(capacity, dtype=np.int32)
+        self._active = np.zeros(capacity, dtype=bool)
+
+        self._categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self._influencers: List[str] = []
+        self._influencer_codes: Dict[str, int] = {}
+
+        # Running [count, verified, trust_sum] per day ordinal / category code /
+        # influencer code. Plain lists: scalar updates are cheaper than on arrays
+        self._daily: Dict[int, List[float]] = {}
+        self._category_totals: List[List[float]] = []
+        self._influencer_totals: List[List[float]] = []
+        self._statuses: Dict[str, int] = {}
+        self._histogram = [0] * TRUST_BINS
+        self._count = 0
+        self._verified_count = 0
+        self._trust_sum = 0.0
+        self._trust_sq_sum = 0.0
+
+        self.rollups = Rollups(hourly_retention=int(os.getenv("ANALYTICS_HOURLY_RETENTION", "48")))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _code(self, value: str, names: List[str], codes: Dict[str, int], totals: List[List[float]]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+            totals.append([0, 0, 0.0])
+        return code
+
+    def _grow(self):
+        capacity = max(1024, len(self._day) * 2)
+        for name in ("_day", "_trust", "_verified", "_category", "_influencer", "_active"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def on_claim_event(self, event: str, claim, previous=None):
+        """ClaimRepository listener"""
+        if event in ("update", "remove"):
+            removed = previous if previous is not None else claim
+            self._retract(removed)
+            self.rollups.add(removed, -1)
+        if event in ("add", "update"):
+            self._ingest(claim)
+            self.rollups.add(claim)
+
+    def _ingest(self, claim):
+        row = self._rows.get(claim.id)
+        if row is None:
+            if self._size == len(self._day):
+                self._grow()
+            row = self._rows[claim.id] = self._size
+            self._size += 1
+
+        day = _day(claim.date)
+        verified = claim.verification_status == "Verified"
+        category = self._code(claim.category, self._categories, self._category_codes, self._category_totals)
+        influencer = self._code(claim.influencer_id, self._influencers, self._influencer_codes, self._influencer_totals)
+        self._day[row] = day if day is not None else -1
+        self._trust[row] = claim.trust_score
+        self._verified[row] = verified
+        self._category[row] = category
+        self._influencer[row] = influencer
+        self._active[row] = True
+        self._apply(day, claim.trust_score, verified, category, influencer, claim.verification_status, 1)
+
+    def _retract(self, claim):
+        row = self._rows.get(claim.id)
+        if row is None or not self._active[row]:
+            return
+        self._active[row] = False
+        day = int(self._day[row])
+        self._apply(
+            day if day >= 0 else None,
+            float(self._trust[row]),
+            bool(self._verified[row]),
+            int(self._category[row]),
+            int(self._influencer[row]),
+            claim.verification_status,
+            -1
+        )
+
+    def _apply(self, day: Optional[int], trust: float, verified: bool, category: int, influencer: int, status: str, sign: int):
+        groups = [self._category_totals[category], self._influencer_totals[influencer]]
+        if day is not None:
+            groups.append(self._daily.setdefault(day, [0, 0, 0.0]))
+        for totals in groups:
+            totals[0] += sign
+            totals[1] += sign * verified
+            totals[2] += sign * trust
+        if day is not None and self._daily[day][0] <= 0:
+            del self._daily[day]
+        self._statuses[status] = self._statuses.get(status, 0) + sign
+        self._histogram[min(TRUST_BINS - 1, max(0, int(trust // (100 / TRUST_BINS))))] += sign
+        self._count += sign
+        self._verified_count += sign * verified
+        self._trust_sum += sign * trust
+        self._trust_sq_sum += sign * trust * trust
 
-    def generate_report(self, claims: List[Dict], influencers: List[Dict]) -> Dict:
-        df_claims = pd.DataFrame(claims)
-        df_influencers = pd.DataFrame(influencers)
-        
+    def summary(self, window: str) -> Optional[RollupSummary]:
+        """Rollup totals for a window name; None for "all" (raises ValueError if unknown)"""
+        hours = parse_window(window)
+        return None if hours is None else self.rollups.query(hours)
+
+    def generate_report(self, influencers: List, window: str = "all") -> Dict:
+        summary = self.summary(window)
+        if summary is not None:
+            return self._windowed_report(summary, influencers)
+
+        first, counts = self._dense_daily()
+        categories = {name: self._category_totals[code] for code, name in enumerate(self._categories)}
+        return {
+            "overall_stats": self._calculate_overall_stats(),
+            "trends": self._analyze_trends(first, counts),
+            "influencer_impact": self._analyze_influencer_impact(influencers, self._influencer_group),
+            "category_analysis": self._analyze_categories(categories, self._count),
+            "trust_metrics": self._analyze_trust_metrics(influencers)
+        }
+
+    def _windowed_report(self, summary: RollupSummary, influencers: List) -> Dict:
+        count, verified, trust_sum, trust_sq_sum = summary.totals
+        first = summary.first_day
+        counts = np.zeros(summary.last_day - first + 1)
+        for day, n in summary.daily.items():
+            counts[day - first] = n
+        mean = trust_sum / count if count else 0
+        return {
+            "overall_stats": {
+                "total_claims": int(count),
+                "avg_trust_score": mean,
+                "verified_percentage": verified / count * 100 if count else 0,
+                "claims_per_day": float(counts.mean())
+            },
+            "trends": self._analyze_trends(first, counts),
+            "influencer_impact": self._analyze_influencer_impact(influencers, summary.influencers.get),
+            "category_analysis": self._analyze_categories(summary.categories, count),
+            "trust_metrics": {
+                "avg_trust_score": mean,
+                "std_trust_score": max(0.0, trust_sq_sum / count - mean * mean) ** 0.5 if count else 0,
+                "verified_claims": int(verified)
+            }
+        }
+
+    def _influencer_group(self, influencer_id: str) -> Optional[List[float]]:
+        code = self._influencer_codes.get(influencer_id)
+        return None if code is None else self._influencer_totals[code]
+
+    def _dense_daily(self):
+        """(first day ordinal, counts per day) from the first to the last claim day"""
+        if not self._daily:
+            return None, np.zeros(0)
+        first, last = min(self._daily), max(self._daily)
+        counts = np.zeros(last - first + 1)
+        for day, totals in self._daily.items():
+            counts[day - first] = totals[0]
+        return first, counts
+
+    def _calculate_daily_volume(self) -> float:
+        _, counts = self._dense_daily()
+        return float(counts.mean()) if len(counts) else 0
+
+    def _calculate_overall_stats(self) -> Dict:
         return {
-            "overall_stats": self._calculate_overall_stats(df_claims),
-            "trends": self._analyze_trends(df_claims),
-            "influencer_impact": self._analyze_influencer_impact(df_claims, df_influencers),
-            "category_analysis": self._analyze_categories(df_claims),
-            "trust_metrics": self._analyze_trust_metrics(df_claims, df_influencers)
+            "total_claims": self._count,
+            "avg_trust_score": self._trust_sum / self._count if self._count else 0,
+            "verified_percentage": self._verified_count / self._count * 100 if self._count else 0,
+            "claims_per_day": self._calculate_daily_volume()
         }
 
-    def _calculate_overall_stats(self, df: pd.DataFrame) -> Dict:
+    def _analyze_trends(self, first: Optional[int], counts: np.ndarray) -> Dict:
+        days = [date.fromordinal(first + i).isoformat() for i in range(len(counts))]
+
+        # 7-day moving average from a cumulative sum; undefined for the first 6 days
+        cumulative = np.concatenate([[0], np.cumsum(counts)])
+        moving = [None if i < 6 else float(cumulative[i + 1] - cumulative[i - 6]) / 7 for i in range(len(counts))]
+
         return {
-            "total_claims": len(df),
-            "avg_trust_score": df["trust_score"].mean(),
-            "verified_percentage": (df["verification_status"] == "Verified").mean() * 100,
-            "claims_per_day": self._calculate_daily_volume(df)
+            "daily_volume": {day: int(count) for day, count in zip(days, counts)},
+            "moving_average": dict(zip(days, moving)),
+            "trend": self._calculate_trend(counts)
         }
 
-    def _analyze_trends(self, df: pd.DataFrame) -> Dict:
-        df["date"] = pd.to_datetime(df["date"])
-        daily_counts = df.resample("D", on="date").size()
-        
+    def _calculate_trend(self, counts: np.ndarray) -> Dict:
+        """Least-squares slope of daily volume, in claims per day"""
+        if len(counts) < 2:
+            return {"slope": 0.0, "direction": "stable"}
+        x = np.arange(len(counts))
+        slope = float(np.polyfit(x, counts, 1)[0])
+        direction = "stable" if abs(slope) < 0.01 else ("increasing" if slope > 0 else "decreasing")
+        return {"slope": slope, "direction": direction}
+
+    def _analyze_influencer_impact(self, influencers: List, group: Callable[[str], Optional[List[float]]], limit: int = 10) -> List[Dict]:
+        """Top influencers by reach: followers x claims x average trust"""
+        impact = []
+        for influencer in influencers:
+            totals = group(influencer.id)
+            if totals is None or totals[0] <= 0:
+                continue
+            count, verified, trust_sum = totals[:3]
+            avg_trust = trust_sum / count
+            impact.append({
+                "influencer_id": influencer.id,
+                "name": influencer.name,
+                "follower_count": influencer.follower_count,
+                "total_claims": int(count),
+                "verified_percentage": verified / count * 100,
+                "avg_trust_score": avg_trust,
+                "impact_score": influencer.follower_count * count * avg_trust / 100
+            })
+        impact.sort(key=lambda x: x["impact_score"], reverse=True)
+        return impact[:limit]
+
+    def _analyze_categories(self, groups: Dict[str, List[float]], total: float) -> Dict:
+        categories = {}
+        for category, totals in groups.items():
+            count, verified, trust_sum = totals[:3]
+            if count <= 0:
+                continue
+            categories[category] = {
+                "total_claims": int(count),
+                "share": count / total * 100,
+                "avg_trust_score": trust_sum / count,
+                "verified_percentage": verified / count * 100
+            }
+        return categories
+
+    def _analyze_trust_metrics(self, influencers: List) -> Dict:
+        count = self._count
+        mean = self._trust_sum / count if count else 0
+        variance = max(0.0, self._trust_sq_sum / count - mean * mean) if count else 0
+        width = 100 / TRUST_BINS
         return {
-            "daily_volume": daily_counts.to_dict(),
-            "moving_average": daily_counts.rolling(7).mean().to_dict(),
-            "trend": self._calculate_trend(daily_counts)
+            "avg_trust_score": mean,
+            "std_trust_score": variance ** 0.5,
+            "median_trust_score": self._histogram_quantile(0.5),
+            "distribution": {
+                f"{int(i * width)}-{int((i + 1) * width)}": int(n) for i, n in enumerate(self._histogram)
+            },
+            "verification_status": {status: n for status, n in self._statuses.items() if n > 0},
+            "avg_influencer_trust_score": (
+                sum(influencer.trust_score for influencer in influencers) / len(influencers) if influencers else 0
+            )
         }
 
+    def _histogram_quantile(self, q: float) -> float:
+        """Quantile interpolated within the histogram bin that contains it"""
+        cumulative = np.cumsum(self._histogram)
+        total = cumulative[-1]
+        if not total:
+            return 0
+        target = q * total
+        i = int(np.searchsorted(cumulative, target))
+        below = cumulative[i - 1] if i else 0
+        width = 100 / TRUST_BINS
+        return float(i * width + width * (target - below) / self._histogram[i])
@@ -1,25 +1,71 @@
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 import asyncio
+import os
+from contextlib import aclosing
 from datetime import datetime
 
 class BatchProcessor:
-    def __init__(self, perplexity_service, journal_api):
+    def __init__(self, perplexity_service, journal_api, max_in_flight: int = None):
         self.perplexity = perplexity_service
         self.journal_api = journal_api
-        self.batch_size = 10
-        self.delay_between_batches = 1 
+        # Upper bound only; the per-upstream limiters decide the real pace
+        self.max_in_flight = max_in_flight or int(os.getenv("BATCH_MAX_IN_FLIGHT", "32"))
 
     async def process_claims(self, claims: List[str]) -> List[Dict]:
-        results = []
-        for i in range(0, len(claims), self.batch_size):
-            batch = claims[i:i + self.batch_size]
-            batch_results = await asyncio.gather(*[
-                self._process_single_claim(claim) for claim in batch
-            ])
-            results.extend(batch_results)
-            await asyncio.sleep(self.delay_between_batches)
+        """Process claims through a sliding window, keeping input order.
+
+        A new claim starts as soon as any in-flight one finishes, so one slow
+        claim holds a single slot instead of stalling a whole chunk.
+        """
+        results = [None] * len(claims)
+        async with aclosing(self._completions(claims)) as completions:
+            async for index, task in completions:
+                results[index] = task.result()
         return results
 
+    async def process_claims_stream(self, claims: List[str]) -> AsyncIterator[Dict]:
+        """Yield one record per claim in completion order, then a summary.
+
+        Records are {"type": "result" | "error", "index", "claim", ...} with
+        running "completed"/"total" counts, followed by {"type": "done"}.
+        Closing the generator early (e.g. the client went away) cancels
+        every claim still in flight.
+        """
+        total = len(claims)
+        completed = errors = 0
+        async with aclosing(self._completions(claims)) as completions:
+            async for index, task in completions:
+                completed += 1
+                record = {"index": index, "claim": claims[index], "completed": completed, "total": total}
+                if task.exception() is None:
+                    yield {"type": "result", **record, "result": task.result()}
+                else:
+                    errors += 1
+                    yield {"type": "error", **record, "error": str(task.exception()) or type(task.exception()).__name__}
+        yield {"type": "done", "completed": completed, "errors": errors, "total": total}
+
+    async def _completions(self, claims: List[str]) -> AsyncIterator:
+        """(index, finished task) pairs with at most max_in_flight running"""
+        pending = {}
+        remaining = iter(enumerate(claims))
+        try:
+            while True:
+                for index, claim in remaining:
+                    pending[asyncio.ensure_future(self._process_single_claim(claim))] = index
+                    if len(pending) >= self.max_in_flight:
+                        break
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield pending.pop(task), task
+        finally:
+            # Cancelling a claim cancels its upstream calls unless another caller shares them
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def _process_single_claim(self, claim: str) -> Dict:
         perplexity_analysis = await self.perplexity.analyze_claim(claim)
         journal_validation = await self.journal_api.validate_claim(claim)
@@ -0,0 +1,50 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+class BlockingExecutor:
+    """Bounded thread pool for calling synchronous SDKs from async code.
+
+    `run` hands the call to one of `max_workers` threads and waits at most
+    `timeout` seconds, so a slow SDK call never blocks the event loop. A
+    call that times out keeps its thread until the SDK returns, which is
+    why the pool is bounded: a stuck upstream can use up its own threads
+    but nothing else.
+    """
+    def __init__(self, name: str, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.name = name
+        self.max_workers = max_workers or int(os.getenv("SOCIAL_API_THREADS", "4"))
+        self.timeout = timeout or float(os.getenv("SOCIAL_API_TIMEOUT", "20"))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self.calls = 0
+        self.timeouts = 0
+        self.in_flight = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        self.calls += 1
+        self.in_flight += 1
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs)),
+                self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise asyncio.TimeoutError(f"{self.name} call timed out after {self.timeout}s") from None
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict:
+        return {
+            "max_workers": self.max_workers,
+            "timeout": self.timeout,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "timeouts": self.timeouts
+        }
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
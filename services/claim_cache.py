@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_claim(text: str) -> str:
+    """Fold case, punctuation and whitespace so restated claims share a key"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+class ClaimCache:
+    """Content-addressed TTL cache with an in-memory LRU and optional SQLite tier.
+
+    Entries are keyed on a hash of the normalized text (plus an optional scope,
+    e.g. the journal sources queried). Values must be JSON serializable when a
+    `path` is given so they survive restarts.
+    """
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 10000,
+        ttl: float = 86400,
+        path: Optional[str] = None,
+        key_func: Callable[[str], str] = normalize_claim
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.key_func = key_func
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._db.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls, namespace: str, **kwargs) -> "ClaimCache":
+        """Build a cache sized by ANALYSIS_CACHE_SIZE / _TTL / _PATH"""
+        return cls(
+            namespace,
+            max_entries=int(os.getenv("ANALYSIS_CACHE_SIZE", "10000")),
+            ttl=float(os.getenv("ANALYSIS_CACHE_TTL", "86400")),
+            path=os.getenv("ANALYSIS_CACHE_PATH") or None,
+            **kwargs
+        )
+
+    def make_key(self, text: str, scope: str = "") -> str:
+        return hashlib.sha256(f"{scope}\0{self.key_func(text)}".encode()).hexdigest()
+
+    def get(self, text: str, scope: str = "") -> Optional[Any]:
+        key = self.make_key(text, scope)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row and row[1] > now:
+                    value = json.loads(row[0])
+                    self._store(key, value, row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, text: str, value: Any, scope: str = "", ttl: Optional[float] = None):
+        key = self.make_key(text, scope)
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value), expires_at)
+                )
+                self._db.commit()
+
+    def _store(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "persistent": self._db is not None
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,222 @@
+from collections import Counter
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from services.pagination import OrderedIndex, id_key
+
+CLAIM_SORTS = ("id", "-id", "date", "-date")
+
+def _sort_key(claim, field: str) -> Tuple:
+    return (claim.date, *id_key(claim.id)) if field == "date" else id_key(claim.id)
+
+def _in_range(value: str, date_from: Optional[str], date_to: Optional[str]) -> bool:
+    # ISO strings compare chronologically; date_to="2024-01-31" includes that whole day
+    return (not date_from or value >= date_from) and (not date_to or value[:len(date_to)] <= date_to)
+
+class ClaimStats:
+    """Running aggregates over a group of claims"""
+    __slots__ = ("count", "verified", "trust_sum", "categories", "statuses")
+
+    def __init__(self):
+        self.count = 0
+        self.verified = 0
+        self.trust_sum = 0.0
+        self.categories = Counter()
+        self.statuses = Counter()
+
+    def add(self, claim, sign: int = 1):
+        self.count += sign
+        self.trust_sum += sign * claim.trust_score
+        if claim.verification_status == "Verified":
+            self.verified += sign
+        for counter, key in ((self.categories, claim.category), (self.statuses, claim.verification_status)):
+            counter[key] += sign
+            if counter[key] <= 0:
+                del counter[key]
+
+    @property
+    def avg_trust_score(self) -> float:
+        return self.trust_sum / self.count if self.count > 0 else 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_claims": self.count,
+            "verified_claims": self.verified,
+            "avg_trust_score": self.avg_trust_score
+        }
+
+class ClaimRepository:
+    """In-memory claim store with secondary indexes and incremental aggregates.
+
+    Behaves like the dict it replaces (`claims[id]`, `in`, `len`, `values()`),
+    and additionally keeps insertion-ordered id sets per influencer, category
+    and verification status plus ClaimStats per influencer and category, so
+    per-influencer listings are O(result) and stats are O(1). Per influencer
+    it also keeps OrderedIndexes by id and by date for keyset pagination,
+    and one by id over all claims for chunked scans.
+
+    Listeners registered with `subscribe` are called as
+    `listener(event, claim, previous)` with event "add", "update" or
+    "remove" after every change.
+    """
+    def __init__(self):
+        self._claims: Dict[str, Any] = {}
+        self._by_influencer: Dict[str, Dict[str, None]] = {}
+        self._by_category: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self.totals = ClaimStats()
+        self._influencer_stats: Dict[str, ClaimStats] = {}
+        self._category_stats: Dict[str, ClaimStats] = {}
+        self._ordered: Dict[str, Dict[str, OrderedIndex]] = {}
+        self._ids = OrderedIndex()
+        self._listeners: List[Callable[[str, Any, Optional[Any]], None]] = []
+
+    def subscribe(self, listener: Callable[[str, Any, Optional[Any]], None]):
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, claim, previous=None):
+        for listener in self._listeners:
+            listener(event, claim, previous)
+
+    def __len__(self) -> int:
+        return len(self._claims)
+
+    def __contains__(self, claim_id: str) -> bool:
+        return claim_id in self._claims
+
+    def __getitem__(self, claim_id: str):
+        return self._claims[claim_id]
+
+    def __setitem__(self, claim_id: str, claim):
+        if claim_id != claim.id:
+            raise ValueError("Claim id does not match key")
+        self.add(claim)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._claims)
+
+    def get(self, claim_id: str, default=None):
+        return self._claims.get(claim_id, default)
+
+    def values(self):
+        return self._claims.values()
+
+    def _index(self, claim, sign: int):
+        for index, key in (
+            (self._by_influencer, claim.influencer_id),
+            (self._by_category, claim.category),
+            (self._by_status, claim.verification_status)
+        ):
+            if sign > 0:
+                index.setdefault(key, {})[claim.id] = None
+            else:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.pop(claim.id, None)
+                    if not ids:
+                        del index[key]
+
+        ordered = self._ordered.setdefault(claim.influencer_id, {"id": OrderedIndex(), "date": OrderedIndex()})
+        for field, index in ordered.items():
+            (index.add if sign > 0 else index.remove)(_sort_key(claim, field))
+        if not len(ordered["id"]):
+            del self._ordered[claim.influencer_id]
+        (self._ids.add if sign > 0 else self._ids.remove)(_sort_key(claim, "id"))
+
+        self.totals.add(claim, sign)
+        for stats, key in ((self._influencer_stats, claim.influencer_id), (self._category_stats, claim.category)):
+            group = stats.setdefault(key, ClaimStats())
+            group.add(claim, sign)
+            if group.count <= 0:
+                del stats[key]
+
+    def add(self, claim):
+        """Insert a claim, or replace the stored claim with the same id"""
+        previous = self._claims.get(claim.id)
+        if previous is not None:
+            self._index(previous, -1)
+        self._claims[claim.id] = claim
+        self._index(claim, 1)
+        self._notify("add" if previous is None else "update", claim, previous)
+
+    def add_many(self, claims: Iterable):
+        for claim in claims:
+            self.add(claim)
+
+    def remove(self, claim_id: str):
+        claim = self._claims.pop(claim_id, None)
+        if claim is not None:
+            self._index(claim, -1)
+            self._notify("remove", claim)
+        return claim
+
+    def _select(self, index: Dict[str, Dict[str, None]], key: str) -> List:
+        return [self._claims[claim_id] for claim_id in index.get(key, ())]
+
+    def by_influencer(self, influencer_id: str) -> List:
+        return self._select(self._by_influencer, influencer_id)
+
+    def by_category(self, category: str) -> List:
+        return self._select(self._by_category, category)
+
+    def by_status(self, verification_status: str) -> List:
+        return self._select(self._by_status, verification_status)
+
+    def recent_by_influencer(self, influencer_id: str, limit: int) -> List:
+        """The last `limit` claims stored for an influencer, oldest first"""
+        ids = self._by_influencer.get(influencer_id, {})
+        return [self._claims[claim_id] for claim_id in reversed(list(islice(reversed(ids), limit)))]
+
+    def page(
+        self,
+        influencer_id: str,
+        sort: str = "id",
+        after: Optional[Tuple] = None,
+        limit: int = 50,
+        match: Optional[Callable[[Any], bool]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Tuple[List, Optional[Tuple]]:
+        """Up to `limit` of an influencer's claims in `sort` order, after the key `after`.
+
+        Returns the claims and the key of the last one, or None for the key
+        when the walk reached the end. Sorted by date, the date range narrows
+        the walk itself; other filters are checked claim by claim.
+        """
+        field, reverse = sort.lstrip("-"), sort.startswith("-")
+        ordered = self._ordered.get(influencer_id)
+        if ordered is None:
+            return [], None
+        if field == "date":
+            # Start the walk at the near end of the date range
+            bound = (date_to + "\uffff",) if reverse and date_to else (date_from,) if not reverse and date_from else None
+            if bound and (after is None or (after > bound if reverse else after < bound)):
+                after = bound
+
+        results = []
+        for key in ordered[field].walk(after, reverse):
+            claim = self._claims[key[-1]]
+            if field == "date" and not _in_range(claim.date, date_from if reverse else None, None if reverse else date_to):
+                # Sorted by date, we have walked past the far end of the range
+                break
+            if not _in_range(claim.date, date_from, date_to) or (match is not None and not match(claim)):
+                continue
+            results.append(claim)
+            if len(results) >= limit:
+                return results, key
+        return results, None
+
+    def scan(self, after: Optional[Tuple] = None, limit: int = 1000) -> Tuple[List, Optional[Tuple]]:
+        """Up to `limit` claims of any influencer in id order, after the key `after`.
+
+        Returns the claims and the key to resume after, or None at the end;
+        each call re-bisects, so claims may change between calls.
+        """
+        keys = self._ids.slice(after, limit)
+        results = [claim for claim in map(self._claims.get, (key[-1] for key in keys)) if claim is not None]
+        return results, keys[-1] if len(keys) == limit else None
+
+    def influencer_stats(self, influencer_id: str) -> ClaimStats:
+        return self._influencer_stats.get(influencer_id) or ClaimStats()
+
+    def category_stats(self, category: str) -> ClaimStats:
+        return self._category_stats.get(category) or ClaimStats()
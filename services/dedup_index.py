@@ -0,0 +1,193 @@
+import json
+import os
+import zlib
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+_PRIME = np.uint64((1 << 32) + 15)
+
+class NearDuplicateIndex:
+    """MinHash/LSH index answering "is there a stored claim with ratio > threshold".
+
+    Claims are shingled into lowercase character n-grams and hashed into
+    `num_perm` MinHash values split into `bands` LSH bands. A lookup only
+    compares against claims sharing at least one band, and every candidate is
+    confirmed with the same SequenceMatcher ratio the linear check used, so a
+    hit always means ratio > threshold. The defaults (32 bands of 3 rows) pick
+    up claims whose shingle Jaccard similarity is 0.5 with ~99% probability,
+    which covers word-level rewrites that score 0.8 with SequenceMatcher.
+    Candidates whose MinHash-estimated Jaccard is below `min_jaccard` are
+    dropped with one vectorized comparison before any SequenceMatcher runs.
+
+    With `path` set, texts and signatures are appended to `<path>.texts.jsonl`
+    and `<path>.sig` on every insert and reloaded without re-hashing.
+    """
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 96,
+        bands: int = 32,
+        shingle_size: int = 4,
+        min_jaccard: float = 0.3,
+        seed: int = 1,
+        path: Optional[str] = None
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_jaccard = min_jaccard
+        self.seed = seed
+
+        # a < 2**32 keeps a * hash + b inside uint64 without wrapping
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+        self._texts: List[str] = []
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self._exact: Dict[str, int] = {}
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+
+        self.path = path
+        self._texts_file = None
+        self._sig_file = None
+        if path:
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def signature(self, text: str) -> np.ndarray:
+        text = text.lower()
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(len(text) - k + 1, 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        r = self.rows
+        return [hash(signature[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def _insert(self, text: str, signature: np.ndarray) -> int:
+        claim_id = len(self._texts)
+        if claim_id == len(self._signatures):
+            self._signatures = np.resize(self._signatures, (claim_id * 2, self.num_perm))
+        # Low 32 bits are plenty for estimating similarity
+        self._signatures[claim_id] = signature
+        self._texts.append(text)
+        self._exact.setdefault(text.lower(), claim_id)
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            bucket = table.get(key)
+            if bucket is None:
+                table[key] = [claim_id]
+            else:
+                bucket.append(claim_id)
+        return claim_id
+
+    def add(self, text: str) -> int:
+        """Index a claim and return its position; identical texts are stored once"""
+        existing = self._exact.get(text.lower())
+        if existing is not None:
+            return existing
+        signature = self.signature(text)
+        if self._texts_file is not None:
+            self._texts_file.write(json.dumps(text) + "\n")
+            self._texts_file.flush()
+            self._sig_file.write(signature.tobytes())
+            self._sig_file.flush()
+        return self._insert(text, signature)
+
+    def add_many(self, texts: Iterable[str]) -> List[int]:
+        return [self.add(text) for text in texts]
+
+    def find_similar(self, text: str) -> Optional[str]:
+        """Return a stored claim with SequenceMatcher ratio > threshold, if any"""
+        lowered = text.lower()
+        exact = self._exact.get(lowered)
+        if exact is not None:
+            return self._texts[exact]
+
+        signature = self.signature(text)
+        candidates = set()
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            bucket = table.get(key)
+            if bucket:
+                candidates.update(bucket)
+        if not candidates:
+            return None
+
+        candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        estimated = (self._signatures[candidates] == signature.astype(np.uint32)).mean(axis=1)
+        order = np.argsort(-estimated)
+        candidates = candidates[order][estimated[order] >= self.min_jaccard]
+
+        for claim_id in candidates:
+            other = self._texts[claim_id].lower()
+            # ratio() can never exceed 2 * min(len) / total length
+            if 2 * min(len(lowered), len(other)) <= self.threshold * (len(lowered) + len(other)):
+                continue
+            matcher = SequenceMatcher(None, lowered, other)
+            if matcher.quick_ratio() > self.threshold and matcher.ratio() > self.threshold:
+                return self._texts[claim_id]
+        return None
+
+    def contains_similar(self, text: str) -> bool:
+        return self.find_similar(text) is not None
+
+    def _meta(self) -> Dict:
+        return {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "seed": self.seed
+        }
+
+    def _load(self, path: str):
+        texts_path, sig_path, meta_path = f"{path}.texts.jsonl", f"{path}.sig", f"{path}.meta.json"
+        texts = []
+        truncated = False
+        if os.path.exists(texts_path):
+            with open(texts_path) as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        texts.append(json.loads(line))
+                    else:
+                        truncated = True
+
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+        signatures = np.empty((0, self.num_perm), dtype=np.uint64)
+        if meta == self._meta() and os.path.exists(sig_path):
+            raw = np.fromfile(sig_path, dtype=np.uint64)
+            signatures = raw[:len(raw) // self.num_perm * self.num_perm].reshape(-1, self.num_perm)
+
+        # Signatures written with other parameters, or cut short by a crash, are recomputed
+        count = min(len(texts), len(signatures))
+        if len(signatures) != len(texts):
+            signatures = np.vstack([signatures[:count]] + [self.signature(t)[None, :] for t in texts[count:]])
+            signatures.tofile(sig_path)
+        with open(meta_path, "w") as f:
+            json.dump(self._meta(), f)
+
+        for text, signature in zip(texts, signatures):
+            self._insert(text, signature)
+
+        if truncated:
+            with open(texts_path, "w") as f:
+                f.writelines(json.dumps(t) + "\n" for t in texts)
+        self._texts_file = open(texts_path, "a")
+        self._sig_file = open(sig_path, "ab")
+
+    def close(self):
+        for f in (self._texts_file, self._sig_file):
+            if f is not None:
+                f.close()
+        self._texts_file = self._sig_file = None
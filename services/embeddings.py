@@ -0,0 +1,101 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+
+class EmbeddingEngine:
+    """Batched, cached sentence embeddings on CPU.
+
+    Texts are encoded in batches and the L2-normalized vectors are kept in an
+    LRU keyed by a hash of the text, so cosine similarity is a plain dot
+    product. `encode` returns None when sentence-transformers is not
+    installed so callers can fall back to SequenceMatcher.
+    """
+    def __init__(self, model_name: Optional[str] = None, cache_size: Optional[int] = None, batch_size: int = 64):
+        self.model_name = model_name or os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        self.cache_size = cache_size or int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))
+        self.batch_size = batch_size
+        self.model = None
+        self._unavailable = False
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> bool:
+        if self.model is None and not self._unavailable:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self.model = SentenceTransformer(self.model_name, device="cpu")
+            except Exception as e:
+                print(f"Warning: SentenceTransformer not available ({e}). Falling back to basic similarity.")
+                self._unavailable = True
+        return self.model is not None
+
+    @property
+    def available(self) -> bool:
+        return self._load()
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self.model.get_sentence_embedding_dimension() if self._load() else None
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def encode(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Return an (n, dim) float32 matrix of normalized embeddings, or None"""
+        if not self._load():
+            return None
+
+        keys = [self._key(text) for text in texts]
+        found = {}
+        missing = {}
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    found[key] = vector
+                    self.hits += 1
+                else:
+                    missing[key] = text
+                    self.misses += 1
+
+        if missing:
+            vectors = self.model.encode(
+                list(missing.values()),
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ).astype(np.float32)
+            found.update(zip(missing, vectors))
+            with self._lock:
+                for key, vector in zip(missing, vectors):
+                    self._cache[key] = vector
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        if not keys:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def similarity_matrix(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Pairwise cosine similarities of `texts` in one matrix product"""
+        embeddings = self.encode(texts)
+        return None if embeddings is None else embeddings @ embeddings.T
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "loaded": self.model is not None,
+            "cache_size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,100 @@
+import csv
+import io
+import sys
+import time
+from typing import Callable, Iterable, Iterator, List, Optional
+from services.response_cache import dumps
+from services.storage import CLAIM_COLUMNS
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+class ExportProgress:
+    """Rows written so far and the resulting throughput"""
+    def __init__(self):
+        self.rows = 0
+        self.started = time.perf_counter()
+
+    def count(self, chunks: Iterable[List[tuple]]) -> Iterator[List[tuple]]:
+        for rows in chunks:
+            self.rows += len(rows)
+            yield rows
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed else 0
+
+    def report(self, label: str) -> str:
+        return f"Exported {self.rows} claims as {label} in {self.elapsed:.1f}s ({self.rows_per_sec:.0f} rows/sec)"
+
+def ndjson_chunks(chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """One JSON object per claim, one encoded block per chunk"""
+    for rows in chunks:
+        yield b"".join(dumps(dict(zip(CLAIM_COLUMNS, row))) + b"\n" for row in rows)
+
+def csv_chunks(chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """A header line, then one encoded block of CSV rows per chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CLAIM_COLUMNS)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Nothing matched: still send the header
+        yield buffer.getvalue().encode()
+
+def stream_export(chunks: Iterable[List[tuple]], fmt: str, on_done: Optional[Callable[[ExportProgress], None]] = None) -> Iterator[bytes]:
+    """Encode claim chunks as NDJSON or CSV; `on_done` gets the progress once the stream ends"""
+    progress = ExportProgress()
+    encode = ndjson_chunks if fmt == "ndjson" else csv_chunks
+    try:
+        yield from encode(progress.count(chunks))
+    finally:
+        if on_done is not None:
+            on_done(progress)
+
+def write_parquet(chunks: Iterable[List[tuple]], path: str) -> ExportProgress:
+    """Write claim chunks to a Parquet file, one row group per chunk (needs pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(f"Parquet export needs pyarrow ({e})") from e
+
+    schema = pa.schema([
+        (column, pa.float64() if column == "trust_score" else pa.string()) for column in CLAIM_COLUMNS
+    ])
+    progress = ExportProgress()
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in progress.count(chunks):
+            columns = list(zip(*rows))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+    return progress
+
+def write_export(chunks: Iterable[List[tuple]], fmt: str, path: str) -> ExportProgress:
+    """Write an export to `path` ("-" for stdout) in any of EXPORT_FORMATS"""
+    if fmt == "parquet":
+        return write_parquet(chunks, path)
+    progress = ExportProgress()
+    out = sys.stdout.buffer if path == "-" else open(path, "wb")
+    try:
+        encode = ndjson_chunks if fmt == "ndjson" else csv_chunks
+        for block in encode(progress.count(chunks)):
+            out.write(block)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    return progress
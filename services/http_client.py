@@ -0,0 +1,33 @@
+import os
+from typing import Optional
+import httpx
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def build_async_client(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    timeout: float = 30.0,
+    http2: Optional[bool] = None
+) -> httpx.AsyncClient:
+    """Build a long-lived AsyncClient with a keep-alive connection pool.
+
+    Pool limits fall back to the HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE and
+    HTTP_KEEPALIVE_EXPIRY environment variables. HTTP/2 is enabled when the
+    optional h2 package is installed unless HTTP_ENABLE_HTTP2=0.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections or int(os.getenv("HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=max_keepalive_connections or int(os.getenv("HTTP_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=keepalive_expiry or float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    )
+    if http2 is None:
+        http2 = os.getenv("HTTP_ENABLE_HTTP2", "1") != "0" and _http2_available()
+
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
@@ -0,0 +1,292 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+
+def _encode(value) -> str:
+    # Handlers may return pydantic models (e.g. Claim); store them as plain dicts
+    def default(obj):
+        dump = getattr(obj, "model_dump", None) or getattr(obj, "dict", None)
+        return dump() if dump else str(obj)
+    return json.dumps(value, default=default)
+
+class Job:
+    """One unit of background work and its checkpointed progress"""
+    def __init__(self, queue: "JobQueue", row: Dict):
+        self._queue = queue
+        self.id = row["id"]
+        self.kind = row["kind"]
+        self.params = json.loads(row["params"])
+        self.status = row["status"]
+        self.checkpoint = json.loads(row["checkpoint"]) if row["checkpoint"] else {}
+        self.result = json.loads(row["result"]) if row["result"] else None
+        self.error = row["error"]
+        self.attempts = row["attempts"]
+        self.created_at = row["created_at"]
+        self.updated_at = row["updated_at"]
+        self._saved_at = 0.0
+
+    def save_checkpoint(self, force: bool = False):
+        """Persist `self.checkpoint`; throttled to one write per checkpoint interval"""
+        now = time.monotonic()
+        if force or now - self._saved_at >= self._queue.checkpoint_interval:
+            self._saved_at = now
+            self._queue._update(self.id, checkpoint=_encode(self.checkpoint))
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        job = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "error": self.error,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+        if include_result:
+            job["result"] = self.result
+        return job
+
+class JobQueue:
+    """Local, SQLite-backed background job queue.
+
+    Handlers are registered per job kind with a concurrency cap; each kind
+    gets that many asyncio worker tasks. Jobs, their checkpoints and results
+    live in the `jobs` table, so a restart re-queues whatever was queued or
+    running and handlers resume from their last checkpoint.
+
+    Several processes may share the table (uvicorn workers, the CLI). A job
+    is claimed with a conditional UPDATE that records this queue as its
+    owner, and the owner refreshes the job's heartbeat while it runs; only
+    running jobs whose heartbeat is older than the lease timeout
+    (JOBS_LEASE_TIMEOUT) are taken back, so live work never runs twice.
+    """
+    _COLUMNS = ("id", "kind", "params", "status", "checkpoint", "result", "error", "attempts", "created_at", "updated_at")
+
+    def __init__(self, path: str = ":memory:", checkpoint_interval: float = 1.0, lease_timeout: float = 60.0):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.lease_timeout = lease_timeout
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT NOT NULL, status TEXT NOT NULL, "
+            "checkpoint TEXT, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:
+                self.db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+
+        self._handlers: Dict[str, Callable[[Job], Awaitable[Any]]] = {}
+        self._concurrency: Dict[str, int] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._started = False
+
+    @classmethod
+    def from_env(cls, default_path: str = ":memory:") -> "JobQueue":
+        return cls(
+            os.getenv("JOBS_PATH") or default_path,
+            checkpoint_interval=float(os.getenv("JOBS_CHECKPOINT_INTERVAL", "1.0")),
+            lease_timeout=float(os.getenv("JOBS_LEASE_TIMEOUT", "60"))
+        )
+
+    def register(self, kind: str, handler: Callable[[Job], Awaitable[Any]], concurrency: int = 1):
+        """Run `kind` jobs with `handler`, at most `concurrency` at a time (JOBS_<KIND>_CONCURRENCY)"""
+        self._handlers[kind] = handler
+        self._concurrency[kind] = int(os.getenv(f"JOBS_{kind.upper()}_CONCURRENCY", str(concurrency)))
+
+    def _update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self.db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _claim(self, job_id: str) -> bool:
+        """Take a queued job for this queue; False if another process got it first"""
+        now = time.time()
+        with self._lock:
+            cursor = self.db.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (self.owner, now, now, job_id)
+            )
+        return cursor.rowcount == 1
+
+    def _release(self, job_id: str, **fields):
+        """Final update of a job this queue ran, skipped if its lease was taken over"""
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self.db.execute(
+                f"UPDATE jobs SET {assignments}, owner = NULL, heartbeat = NULL WHERE id = ? AND owner = ?",
+                (*fields.values(), job_id, self.owner)
+            )
+
+    def _reclaim_expired(self) -> List[tuple]:
+        """Re-queue running jobs whose owner stopped heartbeating; (id, kind) of every queued job"""
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                # A NULL heartbeat is a job left running by a version without leases
+                self.db.execute(
+                    "UPDATE jobs SET status = 'queued', owner = NULL, heartbeat = NULL "
+                    "WHERE status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)",
+                    (time.time() - self.lease_timeout,)
+                )
+                rows = self.db.execute("SELECT id, kind FROM jobs WHERE status = 'queued' ORDER BY created_at").fetchall()
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return rows
+
+    async def _keep_leases(self):
+        """Refresh the heartbeat of running jobs and pick up leases other processes let expire"""
+        while True:
+            await asyncio.sleep(self.lease_timeout / 4)
+            with self._lock:
+                self.db.execute(
+                    "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = 'running'",
+                    (time.time(), self.owner)
+                )
+                # cancel() on another process only sets the status
+                cancelled = [row[0] for row in self.db.execute(
+                    "SELECT id FROM jobs WHERE owner = ? AND status = 'cancelled'", (self.owner,)
+                )]
+            for job_id in cancelled:
+                task = self._running.get(job_id)
+                if task is not None:
+                    task.cancel()
+            self._enqueue(self._reclaim_expired())
+
+    def _enqueue(self, rows: List[tuple]):
+        for job_id, kind in rows:
+            if kind in self._queues:
+                self._queues[kind].put_nowait(job_id)
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self.db.execute(f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(self, dict(zip(self._COLUMNS, row))) if row else None
+
+    def submit(self, kind: str, params: Dict) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self.db.execute(
+                "INSERT INTO jobs (id, kind, params, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, _encode(params), now, now)
+            )
+        if self._started:
+            self._queues[kind].put_nowait(job_id)
+        return self._load(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._load(job_id)
+
+    def list(self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 100) -> List[Job]:
+        query = f"SELECT {', '.join(self._COLUMNS)} FROM jobs"
+        conditions, params = [], []
+        for column, value in (("status", status), ("kind", kind)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self.db.execute(query, (*params, limit)).fetchall()
+        return [Job(self, dict(zip(self._COLUMNS, row))) for row in rows]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self._load(job_id)
+        if job is None or job.status not in ("queued", "running"):
+            return job
+        self._update(job_id, status="cancelled")
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return self._load(job_id)
+
+    async def start(self):
+        """Start the workers and re-queue jobs left over from the last run"""
+        if self._started:
+            return
+        self._started = True
+        for kind, concurrency in self._concurrency.items():
+            self._queues[kind] = asyncio.Queue()
+            for _ in range(concurrency):
+                self._workers.append(asyncio.create_task(self._worker(kind)))
+
+        # Jobs whose owner died mid-way resume from their checkpoint
+        self._enqueue(self._reclaim_expired())
+        self._heartbeat = asyncio.create_task(self._keep_leases())
+
+    async def _worker(self, kind: str):
+        queue = self._queues[kind]
+        while True:
+            job_id = await queue.get()
+            if not self._claim(job_id):
+                continue
+            job = self._load(job_id)
+            task = asyncio.ensure_future(self._handlers[kind](job))
+            self._running[job.id] = task
+            try:
+                result = await asyncio.shield(task)
+                self._release(job.id, status="done", result=_encode(result), checkpoint=None)
+            except asyncio.CancelledError:
+                if not task.done():
+                    # The worker itself is shutting down: leave the job resumable
+                    task.cancel()
+                    job.save_checkpoint(force=True)
+                    self._release(job.id, status="queued")
+                    raise
+                # Cancelled through cancel(); the status is already set, only the lease is left
+                self._release(job.id, status="cancelled")
+            except Exception as e:
+                job.save_checkpoint(force=True)
+                self._release(job.id, status="failed", error=getattr(e, "detail", None) or str(e) or type(e).__name__)
+            finally:
+                self._running.pop(job.id, None)
+
+    async def close(self):
+        tasks = self._workers + ([self._heartbeat] if self._heartbeat else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat = None
+        self._started = False
+        with self._lock:
+            self.db.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "statuses": {status: counts.get(status, 0) for status in JOB_STATUSES},
+            "running": len(self._running),
+            "owner": self.owner,
+            "lease_timeout": self.lease_timeout,
+            "concurrency": dict(self._concurrency)
+        }
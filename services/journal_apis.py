@@ -1,26 +1,117 @@
 import asyncio
-from typing import List, Dict
+import os
+from typing import List, Dict, Optional
 import httpx
+from services.claim_cache import ClaimCache, normalize_claim
+from services.single_flight import SingleFlight
+from services.upstream import Upstream
+from services.http_client import build_async_client
+
+# Words that carry no search signal in a claim sentence
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from", "has", "have", "in", "is", "it",
+    "its", "may", "of", "on", "or", "that", "the", "this", "to", "up", "was", "will", "with", "your", "you",
+    "studies", "study", "show", "shows", "research", "indicates", "according", "proven"
+}
+
+# Study designs ranked by strength of evidence, matched against titles/publication types
+_EVIDENCE_WEIGHTS = (
+    ("meta-analysis", 1.0),
+    ("systematic review", 0.9),
+    ("randomized", 0.8),
+    ("randomised", 0.8),
+    ("controlled trial", 0.7),
+    ("cohort", 0.5),
+    ("review", 0.4)
+)
+
+# Title phrases that report a null or negative finding
+_NEGATIVE_CUES = ("no effect", "no significant", "not associated", "no association", "did not", "does not", "fails to", "no evidence", "ineffective")
+
+def build_query(claim: str, max_terms: int = 8) -> str:
+    """Search terms for a claim: normalized, stopwords and numbers dropped"""
+    terms = [term for term in normalize_claim(claim).split() if term not in _STOPWORDS and not term.isdigit()]
+    return " ".join(list(dict.fromkeys(terms))[:max_terms])
+
+def evidence_weight(study: Dict) -> float:
+    text = f"{study.get('title', '')} {' '.join(study.get('publication_types', []))}".lower()
+    return max((weight for phrase, weight in _EVIDENCE_WEIGHTS if phrase in text), default=0.3)
 
 class JournalSource:
-    def __init__(self, name: str, base_url: str, api_key: str = None):
+    def __init__(self, name: str, base_url: str, api_key: str = None, kind: str = "json", timeout: float = 10.0):
         self.name = name
         self.base_url = base_url
         self.api_key = api_key
+        self.kind = kind
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls, key: str, name: str, base_url: str, kind: str = "json") -> "JournalSource":
+        """Overridable with JOURNAL_<KEY>_BASE_URL, _API_KEY and _TIMEOUT"""
+        prefix = f"JOURNAL_{key.upper()}"
+        return cls(
+            name,
+            os.getenv(f"{prefix}_BASE_URL", base_url).rstrip("/"),
+            api_key=os.getenv(f"{prefix}_API_KEY"),
+            kind=kind,
+            timeout=float(os.getenv(f"{prefix}_TIMEOUT", "10"))
+        )
+
+def confidence_score(studies: List[Dict]) -> float:
+    """0-100: average strength of the study designs found, scaled down below 5 studies"""
+    if not studies:
+        return 0
+    weights = [evidence_weight(study) for study in studies]
+    return round(100 * min(1.0, len(studies) / 5) * sum(weights) / len(weights), 1)
 
 class JournalAPI:
     def __init__(self):
         self.sources = {
-            "pubmed": JournalSource("PubMed", "https://api.pubmed.gov"),
-            "cochrane": JournalSource("Cochrane", "https://api.cochrane.org"),
-            "science_direct": JournalSource("ScienceDirect", "https://api.sciencedirect.com")
+            "pubmed": JournalSource.from_env("pubmed", "PubMed", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils", kind="pubmed"),
+            "cochrane": JournalSource.from_env("cochrane", "Cochrane", "https://api.cochrane.org"),
+            "science_direct": JournalSource.from_env("science_direct", "ScienceDirect", "https://api.elsevier.com", kind="elsevier")
         }
-        
+        self.client: Optional[httpx.AsyncClient] = None
+        self.cache = ClaimCache.from_env("journal")
+        # Per-source search responses, keyed on the normalized query
+        self.search_cache = ClaimCache.from_env("journal_search")
+        self.inflight = SingleFlight()
+        # Each source has its own quota and breaker, so a slow one can't stall the others
+        self.upstreams = {name: Upstream.from_env(f"journal_{name}") for name in self.sources}
+        self._backends = {
+            "pubmed": self._search_pubmed,
+            "elsevier": self._search_elsevier,
+            "json": self._search_json
+        }
+
+    async def start(self):
+        """Open the connection pool shared by every source"""
+        if self.client is None:
+            self.client = build_async_client()
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self.cache.close()
+        self.search_cache.close()
+
     async def validate_claim(self, claim: str, sources: List[str] = None) -> Dict:
         """Enhanced validation across multiple journal sources"""
         if not sources:
             sources = list(self.sources.keys())
 
+        scope = ",".join(sorted(sources))
+        cached = self.cache.get(claim, scope=scope)
+        if cached is not None:
+            return cached
+
+        return await self.inflight.do(
+            self.cache.make_key(claim, scope=scope),
+            lambda: self._validate_uncached(claim, sources, scope)
+        )
+
+    async def _validate_uncached(self, claim: str, sources: List[str], scope: str) -> Dict:
         validation_tasks = []
         for source_name in sources:
             if source_name in self.sources:
@@ -38,12 +129,123 @@ class JournalAPI:
                 total_score += result["confidence_score"]
                 valid_results += 1
         
-        return {
+        validation = {
             "sources": [r for r in results if isinstance(r, Dict)],
             "validation_score": total_score / valid_results if valid_results > 0 else 50,
             "supporting_evidence": evidence,
             "consensus_strength": self._calculate_consensus_strength(evidence)
         }
+        # A source that timed out or had its circuit open must be retried next
+        # time; the sources that answered are served from search_cache then
+        if validation_tasks and valid_results == len(validation_tasks):
+            self.cache.set(claim, validation, scope=scope)
+        return validation
+
+    async def search_source(self, source_name: str, claim: str, limit: int = 10) -> Dict:
+        """Studies matching a claim in one source, with a confidence score.
+
+        Failures (timeouts, open circuit, HTTP errors) come back as a result
+        with an "error" key so one bad source doesn't sink the validation.
+        """
+        source = self.sources[source_name]
+        query = build_query(claim)
+        if not query:
+            return {"source": source.name, "studies": [], "confidence_score": 0, "error": "Nothing to search for"}
+
+        cached = self.search_cache.get(query, scope=source_name)
+        if cached is not None:
+            return cached
+
+        try:
+            studies = await self._backends[source.kind](source_name, source, query, limit)
+        except Exception as e:
+            return {"source": source.name, "studies": [], "confidence_score": 0, "error": str(e) or type(e).__name__}
+
+        for study in studies:
+            title = study["title"].lower()
+            study["supports_claim"] = not any(cue in title for cue in _NEGATIVE_CUES)
+        result = {"source": source.name, "query": query, "studies": studies, "confidence_score": confidence_score(studies)}
+        self.search_cache.set(query, result, scope=source_name)
+        return result
+
+    async def _get(self, source_name: str, path: str, params: Dict, headers: Dict = None) -> Dict:
+        source = self.sources[source_name]
+        url = f"{source.base_url}{path}"
+        upstream = self.upstreams[source_name]
+        if self.client is not None:
+            response = await upstream.call(
+                lambda: self.client.get(url, params=params, headers=headers, timeout=source.timeout)
+            )
+        else:
+            # Not started (e.g. used from a script): fall back to a one-off client
+            async with httpx.AsyncClient() as client:
+                response = await upstream.call(
+                    lambda: client.get(url, params=params, headers=headers, timeout=source.timeout)
+                )
+        response.raise_for_status()
+        return response.json()
+
+    async def _search_pubmed(self, source_name: str, source: JournalSource, query: str, limit: int) -> List[Dict]:
+        """NCBI E-utilities: esearch for ids, then esummary for titles and publication types"""
+        auth = {"api_key": source.api_key} if source.api_key else {}
+        search = await self._get(source_name, "/esearch.fcgi", {
+            "db": "pubmed", "term": query, "retmode": "json", "retmax": limit, "sort": "relevance", **auth
+        })
+        ids = search.get("esearchresult", {}).get("idlist", [])
+        if not ids:
+            return []
+
+        summary = await self._get(source_name, "/esummary.fcgi", {
+            "db": "pubmed", "id": ",".join(ids), "retmode": "json", **auth
+        })
+        docs = summary.get("result", {})
+        return [
+            {
+                "id": uid,
+                "title": docs[uid].get("title", ""),
+                "year": docs[uid].get("pubdate", "")[:4],
+                "url": f"https://pubmed.ncbi.nlm.nih.gov/{uid}/",
+                "publication_types": docs[uid].get("pubtype", [])
+            }
+            for uid in ids if uid in docs
+        ]
+
+    async def _search_elsevier(self, source_name: str, source: JournalSource, query: str, limit: int) -> List[Dict]:
+        """Elsevier ScienceDirect Search API (needs JOURNAL_SCIENCE_DIRECT_API_KEY)"""
+        if not source.api_key:
+            raise ValueError(f"{source.name} API key not configured")
+        data = await self._get(
+            source_name,
+            "/content/search/sciencedirect",
+            {"query": query, "count": limit},
+            headers={"X-ELS-APIKey": source.api_key, "Accept": "application/json"}
+        )
+        return [
+            {
+                "id": entry.get("prism:doi") or entry.get("dc:identifier"),
+                "title": entry.get("dc:title") or "",
+                "year": (entry.get("prism:coverDate") or "")[:4],
+                "url": next((link.get("@href") for link in entry.get("link", []) if link.get("@ref") == "scidir"), None),
+                "publication_types": [entry["subtypeDescription"]] if entry.get("subtypeDescription") else []
+            }
+            # An empty result set comes back as a single {"error": ...} entry
+            for entry in data.get("search-results", {}).get("entry", []) if "error" not in entry
+        ]
+
+    async def _search_json(self, source_name: str, source: JournalSource, query: str, limit: int) -> List[Dict]:
+        """Generic search endpoint: GET /search?q=&limit= -> {"results": [{"title", "year", "url", "types"}]}"""
+        headers = {"Authorization": f"Bearer {source.api_key}"} if source.api_key else None
+        data = await self._get(source_name, "/search", {"q": query, "limit": limit}, headers=headers)
+        return [
+            {
+                "id": result.get("id"),
+                "title": result.get("title") or "",
+                "year": str(result.get("year") or ""),
+                "url": result.get("url"),
+                "publication_types": result.get("types", [])
+            }
+            for result in data.get("results", [])
+        ]
 
     def _calculate_consensus_strength(self, evidence: List[Dict]) -> str:
         if not evidence:
@@ -0,0 +1,95 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+WEIGHTING_SCHEMES = ("presence", "frequency", "log")
+
+class KeywordMatcher:
+    """Compiled keyword categorizer scoring every category in one pass.
+
+    Texts are tokenized once and each token is looked up against the keyword
+    table. A keyword matches a token that starts with it ("diet" matches
+    "dietary", "exercise" matches "exercises") but never the middle of a word,
+    so "cure" no longer fires on "secure".
+
+    `weighting` decides how repeated keywords count: "presence" scores each
+    keyword once (the original behaviour), "frequency" counts every
+    occurrence and "log" uses 1 + log(count). `keyword_weights` scales
+    individual keywords.
+    """
+    def __init__(
+        self,
+        keywords: Dict[str, List[str]],
+        weighting: str = "presence",
+        keyword_weights: Optional[Dict[str, float]] = None
+    ):
+        if weighting not in WEIGHTING_SCHEMES:
+            raise ValueError(f"Unknown weighting scheme: {weighting}")
+        self.weighting = weighting
+        self.categories = list(keywords)
+
+        vocabulary = sorted({word.lower() for words in keywords.values() for word in words})
+        self._index = {word: i for i, word in enumerate(vocabulary)}
+        self._lengths = sorted({len(word) for word in vocabulary})
+        keyword_weights = keyword_weights or {}
+
+        # weights[k, c] is what one hit on keyword k adds to category c
+        self._weights = np.zeros((len(vocabulary), len(self.categories)), dtype=np.float64)
+        for c, category in enumerate(self.categories):
+            for word in keywords[category]:
+                word = word.lower()
+                self._weights[self._index[word], c] = keyword_weights.get(word, 1.0)
+
+    def _hits(self, text: str) -> Counter:
+        hits = Counter()
+        for token in _TOKEN.findall(text.lower()):
+            for length in self._lengths:
+                if length > len(token):
+                    break
+                keyword = self._index.get(token[:length])
+                if keyword is not None:
+                    hits[keyword] += 1
+        return hits
+
+    def _transform(self, counts):
+        if self.weighting == "presence":
+            return (counts > 0).astype(np.float64)
+        if self.weighting == "log":
+            return np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0.0)
+        return counts
+
+    def score(self, text: str) -> Dict[str, float]:
+        scores = [0.0] * len(self.categories)
+        for keyword, count in self._hits(text).items():
+            if self.weighting == "presence":
+                hit = 1.0
+            elif self.weighting == "log":
+                hit = 1 + math.log(count)
+            else:
+                hit = float(count)
+            for c, weight in enumerate(self._weights[keyword]):
+                if weight:
+                    scores[c] += weight * hit
+        return dict(zip(self.categories, scores))
+
+    def categorize(self, text: str) -> str:
+        """Best scoring category; ties go to the first category, as before"""
+        scores = self.score(text)
+        return max(scores.items(), key=lambda x: x[1])[0]
+
+    def score_many(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), len(categories)) score matrix from one matrix product"""
+        counts = np.zeros((len(texts), len(self._index)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            for keyword, count in self._hits(text).items():
+                counts[row, keyword] = count
+        return self._transform(counts) @ self._weights
+
+    def categorize_many(self, texts: List[str]) -> List[str]:
+        if not texts:
+            return []
+        return [self.categories[i] for i in np.argmax(self.score_many(texts), axis=1)]
@@ -0,0 +1,47 @@
+from bisect import bisect_left, insort
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+class Leaderboard:
+    """Influencers kept ordered by trust score, highest first.
+
+    Ordering keys live in a bisect-maintained list so an update is a
+    logarithmic search plus one list shift, and a page of the leaderboard
+    is a slice. Equal scores keep registration order, matching the stable
+    sort the endpoint used before.
+    """
+    def __init__(self):
+        self._keys: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, Tuple[Tuple[float, int, str], Any]] = {}
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def upsert(self, influencer):
+        entry = self._entries.get(influencer.id)
+        if entry is not None:
+            old_key, _ = entry
+            if old_key[0] == -influencer.trust_score:
+                self._entries[influencer.id] = (old_key, influencer)
+                return
+            self._keys.pop(bisect_left(self._keys, old_key))
+            key = (-influencer.trust_score, old_key[1], influencer.id)
+        else:
+            key = (-influencer.trust_score, next(self._sequence), influencer.id)
+        insort(self._keys, key)
+        self._entries[influencer.id] = (key, influencer)
+
+    def remove(self, influencer_id: str):
+        entry = self._entries.pop(influencer_id, None)
+        if entry is not None:
+            self._keys.pop(bisect_left(self._keys, entry[0]))
+
+    def top(self, offset: int = 0, limit: Optional[int] = None) -> List:
+        end = None if limit is None else offset + limit
+        return [self._entries[key[2]][1] for key in self._keys[offset:end]]
+
+    def rank(self, influencer_id: str) -> Optional[int]:
+        """1-based position of an influencer"""
+        entry = self._entries.get(influencer_id)
+        return None if entry is None else bisect_left(self._keys, entry[0]) + 1
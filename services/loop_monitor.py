@@ -0,0 +1,54 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional
+
+class LoopLagMonitor:
+    """Measures event loop lag: how late a periodic `sleep(interval)` wakes up.
+
+    Anything that blocks the loop (a synchronous SDK call, heavy CPU work)
+    shows up directly as lag. Keeps the last `window` samples for
+    percentiles plus the all-time maximum.
+    """
+    def __init__(self, interval: float = 0.1, window: int = 600, slow_threshold: float = 0.1):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self._samples = deque(maxlen=window)
+        self.max_lag = 0.0
+        self.slow_ticks = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.slow_threshold:
+                self.slow_ticks += 1
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict:
+        samples = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            return samples[min(len(samples) - 1, int(p * len(samples)))] if samples else 0.0
+
+        return {
+            "interval": self.interval,
+            "samples": len(samples),
+            "last_lag": self._samples[-1] if self._samples else 0.0,
+            "p50_lag": percentile(0.5),
+            "p99_lag": percentile(0.99),
+            "max_lag": self.max_lag,
+            "slow_ticks": self.slow_ticks
+        }
@@ -0,0 +1,100 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAX_PAGE_SIZE = 1000
+
+# Element types of the index keys behind each sort field (see id_key)
+KEY_SHAPES = {"id": (int, str), "date": (str, int, str)}
+
+def id_key(item_id: str) -> Tuple:
+    """Sort key for ids: numeric ids in numeric order, others after them by length"""
+    return (len(item_id), item_id)
+
+class OrderedIndex:
+    """Sorted tuple keys with keyset (cursor) iteration.
+
+    Keys live in a bisect-maintained list, so an insert is a logarithmic
+    search plus one list shift, and resuming after a cursor key is a single
+    bisect; reading a page costs O(log n + page size).
+    """
+    def __init__(self):
+        self._keys: List[Tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Tuple):
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            self._keys.insert(i, key)
+
+    def remove(self, key: Tuple):
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            self._keys.pop(i)
+
+    def slice(self, after: Optional[Tuple] = None, count: int = 1000) -> List[Tuple]:
+        """Up to `count` keys after `after`, copied in one step so later changes can't shift them"""
+        i = 0 if after is None else bisect_right(self._keys, after)
+        return self._keys[i:i + count]
+
+    def walk(self, after: Optional[Tuple] = None, reverse: bool = False) -> Iterator[Tuple]:
+        """Keys strictly after `after` in walk order (descending if `reverse`)"""
+        keys = self._keys
+        if reverse:
+            i = len(keys) if after is None else bisect_left(keys, after)
+            while i > 0:
+                i -= 1
+                yield keys[i]
+        else:
+            i = 0 if after is None else bisect_right(keys, after)
+            while i < len(keys):
+                yield keys[i]
+                i += 1
+
+def encode_cursor(sort: str, key: Optional[Tuple]) -> Optional[str]:
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps([sort, list(key)]).encode()).decode()
+
+def decode_cursor(cursor: Optional[str], sort: str) -> Optional[Tuple]:
+    """The key a cursor resumes after; ValueError if malformed or made for another sort"""
+    if not cursor:
+        return None
+    try:
+        cursor_sort, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort={cursor_sort}, not sort={sort}")
+    # A key of the wrong shape would only fail later, inside bisect
+    shape = KEY_SHAPES[sort.lstrip("-")]
+    if not isinstance(key, list) or len(key) != len(shape) or any(
+        type(value) is not kind for value, kind in zip(key, shape)
+    ):
+        raise ValueError("Malformed cursor")
+    return tuple(key)
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """Comma-separated field names, validated against `allowed`; None means all fields"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+def project(item: Any, fields: Optional[List[str]]) -> Any:
+    """Only `fields` of a model, as a dict; the item itself when fields is None"""
+    if fields is None:
+        return item
+    return {name: getattr(item, name) for name in fields}
+
+def page_response(items: List, fields: Optional[List[str]], sort: str, last_key: Optional[Tuple]) -> Dict:
+    return {
+        "items": [project(item, fields) for item in items],
+        "next_cursor": encode_cursor(sort, last_key)
+    }
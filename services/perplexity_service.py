@@ -2,11 +2,16 @@ from difflib import SequenceMatcher
 import os
 import httpx
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
-import re
-from services.social_media import TwitterAPI
-import numpy as np
+from services.social_media import get_twitter_api
+from services.http_client import build_async_client
+from services.claim_cache import ClaimCache
+from services.single_flight import SingleFlight
+from services.embeddings import EmbeddingEngine
+from services.claim_extraction import ClaimExtractor
+from services.keyword_matcher import KeywordMatcher
+from services.upstream import Upstream
 
 load_dotenv()
 
@@ -15,7 +20,11 @@ class PerplexityService:
         self.api_key = os.getenv("PERPLEXITY_API_KEY")
         if not self.api_key:
             raise ValueError("PERPLEXITY_API_KEY not found in environment variables")
-        self.base_url = "https://api.perplexity.ai/chat/completions"
+        self.base_url = os.getenv("PERPLEXITY_BASE_URL", "https://api.perplexity.ai/chat/completions")
+        self.client: Optional[httpx.AsyncClient] = None
+        self.cache = ClaimCache.from_env("perplexity")
+        self.inflight = SingleFlight()
+        self.upstream = Upstream.from_env("perplexity", rate=5.0)
         self.keywords = {
             "Nutrition": ["vitamin", "protein", "diet", "food", "supplement", "meal", "eating", "nutrient"],
             "Medicine": ["treatment", "cure", "medicine", "drug", "health", "disease", "symptoms", "medical"],
@@ -23,57 +32,44 @@ class PerplexityService:
             "Fitness": ["exercise", "workout", "training", "muscle", "cardio", "strength", "fitness", "gym"],
             "Alternative Medicine": ["natural", "herbal", "holistic", "alternative", "traditional", "healing"]
         }
+        self.keyword_matcher = KeywordMatcher(self.keywords, weighting=os.getenv("KEYWORD_WEIGHTING", "presence"))
         self.social_apis = {
-            "twitter": TwitterAPI()
+            "twitter": get_twitter_api()
         }
-        self.model = None
+        self.embeddings = EmbeddingEngine()
+        self.extractor = ClaimExtractor()
 
-    def _init_sentence_transformer(self):
-        """Lazy initialization of sentence transformer"""
-        try:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        except ImportError:
-            print("Warning: SentenceTransformer not available. Falling back to basic similarity.")
-            self.model = None
+    async def start(self):
+        """Open the shared connection pool used by analyze_claim"""
+        if self.client is None:
+            self.client = build_async_client()
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self.cache.close()
 
     def is_similar(self, claim1: str, claim2: str) -> bool:
         # Basic similarity check using SequenceMatcher
         ratio = SequenceMatcher(None, claim1.lower(), claim2.lower()).ratio()
         if ratio > 0.8:
             return True
-            
-        # Advanced similarity check using sentence transformer if available
-        if self.model is None and ratio <= 0.8:
-            try:
-                self._init_sentence_transformer()
-            except Exception as e:
-                print(f"Warning: Could not initialize sentence transformer: {e}")
-                return ratio > 0.8
-
-        if self.model:
-            try:
-                embeddings1 = self.model.encode(claim1, convert_to_tensor=True)
-                embeddings2 = self.model.encode(claim2, convert_to_tensor=True)
-                cosine_sim = np.dot(embeddings1, embeddings2) / (np.linalg.norm(embeddings1) * np.linalg.norm(embeddings2))
-                return cosine_sim > 0.85
-            except Exception as e:
-                print(f"Warning: Error in advanced similarity check: {e}")
-                return ratio > 0.8
-                
-        return ratio > 0.8
+
+        # Semantic check when the sentence transformer is installed
+        embeddings = self.embeddings.encode([claim1, claim2])
+        if embeddings is None:
+            return False
+        return float(embeddings[0] @ embeddings[1]) > 0.85
 
     def analyze_text(self, content: str) -> Dict:
         """Legacy method for basic analysis without API call"""
-        content = content.lower()
-        
-        category_scores = {cat: 0 for cat in self.keywords}
-        for category, words in self.keywords.items():
-            for word in words:
-                if word in content:
-                    category_scores[category] += 1
-        
-        category = max(category_scores.items(), key=lambda x: x[1])[0]
+        return self._keyword_analysis(self.keyword_matcher.categorize(content))
+
+    def analyze_text_batch(self, contents: List[str]) -> List[Dict]:
+        return [self._keyword_analysis(category) for category in self.keyword_matcher.categorize_many(contents)]
+
+    def _keyword_analysis(self, category: str) -> Dict:
         trust_score = 70  
         
         return {
@@ -83,47 +79,68 @@ class PerplexityService:
         }
 
     async def analyze_claim(self, content: str) -> Dict:
+        cached = self.cache.get(content)
+        if cached is not None:
+            return cached
+
+        # Concurrent scans of the same claim share one upstream request
+        return await self.inflight.do(self.cache.make_key(content), lambda: self._analyze_uncached(content))
+
+    async def _analyze_uncached(self, content: str) -> Dict:
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            prompt = f"""Analyze this health claim with scientific rigor:
-
-            Claim: {content}
-            
-            Provide:
-            1. Category (Nutrition/Medicine/Mental Health/Fitness/Alternative Medicine)
-            2. Key scientific studies or meta-analyses supporting/refuting this claim
-            3. Trust score (0-100) based on:
-               - Quality of available evidence
-               - Scientific consensus
-               - Replication of results
-            4. Verification status with reasoning
-            5. Potential caveats or limitations
-            
-            Format as JSON with keys: category, verification_status, trust_score, evidence, limitations"""
+            analysis = await self._request_analysis(content)
+        except Exception as e:
+            print(f"API Error: {str(e)}")
+            return self.analyze_text(content)
+
+        if analysis is None:
+            return self.analyze_text(content)
+
+        # Only upstream answers are cached; keyword fallbacks are retried next time
+        self.cache.set(content, analysis)
+        return analysis
+
+    async def _request_analysis(self, content: str) -> Optional[Dict]:
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        prompt = f"""Analyze this health claim with scientific rigor:
 
+        Claim: {content}
+        
+        Provide:
+        1. Category (Nutrition/Medicine/Mental Health/Fitness/Alternative Medicine)
+        2. Key scientific studies or meta-analyses supporting/refuting this claim
+        3. Trust score (0-100) based on:
+           - Quality of available evidence
+           - Scientific consensus
+           - Replication of results
+        4. Verification status with reasoning
+        5. Potential caveats or limitations
+        
+        Format as JSON with keys: category, verification_status, trust_score, evidence, limitations"""
+
+        payload = {
+            "model": "pplx-7b-online",
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if self.client is not None:
+            response = await self.upstream.call(
+                lambda: self.client.post(self.base_url, headers=headers, json=payload, timeout=30.0)
+            )
+        else:
+            # Not started (e.g. used from a script): fall back to a one-off client
             async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json={
-                        "model": "pplx-7b-online",
-                        "messages": [{"role": "user", "content": prompt}]
-                    },
-                    timeout=30.0
+                response = await self.upstream.call(
+                    lambda: client.post(self.base_url, headers=headers, json=payload, timeout=30.0)
                 )
-                
-                if response.status_code != 200:
-                    return self.analyze_text(content)  
-                    
-                result = response.json()
-                return self.parse_response(result)
-        except Exception as e:
-            print(f"API Error: {str(e)}")
-            return self.analyze_text(content)  
+
+        if response.status_code != 200:
+            return None
+
+        return self.parse_response(response.json())
 
     def parse_response(self, api_response: Dict) -> Dict:
         try:
@@ -145,23 +162,19 @@ class PerplexityService:
             }
 
     def check_duplicate(self, new_claim: str, existing_claims: List[str]) -> bool:
+        """Linear duplicate check for small ad-hoc lists; stored claims use NearDuplicateIndex"""
+        new_claim = new_claim.lower()
         for claim in existing_claims:
-            from difflib import SequenceMatcher
-            similarity = SequenceMatcher(None, new_claim.lower(), claim.lower()).ratio()
-            if similarity > 0.8:
+            claim = claim.lower()
+            if 2 * min(len(new_claim), len(claim)) <= 0.8 * (len(new_claim) + len(claim)):
+                continue
+            matcher = SequenceMatcher(None, new_claim, claim)
+            if matcher.quick_ratio() > 0.8 and matcher.ratio() > 0.8:
                 return True
         return False
 
     def basic_analysis(self, content: str) -> Dict:
-        content = content.lower()
-        
-        category_scores = {cat: 0 for cat in self.keywords}
-        for category, words in self.keywords.items():
-            for word in words:
-                if word in content:
-                    category_scores[category] += 1
-        
-        category = max(category_scores.items(), key=lambda x: x[1])[0]
+        category = self.keyword_matcher.categorize(content)
         
         trust_score = 50  
         
@@ -183,25 +196,25 @@ class PerplexityService:
     def extract_claims(self, content: List[str]) -> List[str]:
         """Extract health claims from content using NLP"""
         claims = []
-        for text in content:
-            claim_patterns = [
-                r"(studies show|research indicates|according to|proven to|can|may|will) .+",
-                r".+ (increases|decreases|improves|reduces|boosts|helps) .+",
-                r".+ is (good|bad|beneficial|harmful) for .+"
-            ]
-            
-            for pattern in claim_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                claims.extend(match.group(0) for match in matches)
-        
+        for spans in self.extractor.extract_claim_spans_many(content):
+            claims.extend(spans)
         return self.remove_duplicate_claims(claims)
     
     def remove_duplicate_claims(self, claims: List[str]) -> List[str]:
-        unique_claims = []
-        for claim in claims:
-            if not any(self.is_similar(claim, existing) for existing in unique_claims):
-                unique_claims.append(claim)
-        return unique_claims
+        """Keep the first of each group of claims that is_similar would match"""
+        if len(claims) < 2:
+            return list(claims)
+
+        similarities = self.embeddings.similarity_matrix(claims)
+        lowered = [claim.lower() for claim in claims]
+        kept = []
+        for i in range(len(claims)):
+            if similarities is not None and kept and similarities[i, kept].max() > 0.85:
+                continue
+            if any(SequenceMatcher(None, lowered[i], lowered[j]).ratio() > 0.8 for j in kept):
+                continue
+            kept.append(i)
+        return [claims[i] for i in kept]
 
     def calculate_trust_score(self, analysis: Dict) -> float:
         score = 50  
@@ -214,21 +227,7 @@ class PerplexityService:
 
     def extract_health_claim(self, text: str) -> List[str]:
         """Enhanced health claim extraction"""
-        claim_indicators = [
-            r"(studies show|research indicates|according to|proven to|may|can|will) .+",
-            r".+ (increases|decreases|improves|reduces|boosts|helps|prevents) .+",
-            r".+ is (good|bad|beneficial|harmful|effective) for .+",
-            r"(regular|daily|weekly) .+ (can|will|may) .+",
-            r"(taking|consuming|using) .+ (improves|enhances|boosts) .+"
-        ]
-        
-        claims = []
-        sentences = re.split(r'[.!?]+', text)
-        
-        for sentence in sentences:
-            for pattern in claim_indicators:
-                if re.search(pattern, sentence, re.IGNORECASE):
-                    claims.append(sentence.strip())
-                    break
-                    
-        return claims
+        return self.extractor.extract_health_claims(text)
+
+    def extract_health_claims_batch(self, texts: List[str]) -> List[List[str]]:
+        return self.extractor.extract_health_claims_many(texts)
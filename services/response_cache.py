@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(obj):
+    # Pydantic models (Claim, Influencer) and numpy scalars
+    dump = getattr(obj, "model_dump", None) or getattr(obj, "dict", None)
+    if dump:
+        return dump()
+    item = getattr(obj, "item", None)
+    if item:
+        return item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(value: Any) -> bytes:
+    """Serialize to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+class DataVersion:
+    """Monotonic change counters: one global, one per influencer.
+
+    Bumped on every claim event (as a ClaimRepository listener) and every
+    influencer save, so a cached response is current as long as the
+    versions it was built from haven't moved. `influencer_version` only
+    moves on influencer saves, for responses that ignore claims.
+    """
+    def __init__(self):
+        self.version = 0
+        self.influencer_version = 0
+        self._influencers: Dict[str, int] = {}
+
+    def get(self, influencer_id: Optional[str] = None) -> int:
+        if influencer_id is None:
+            return self.version
+        return self._influencers.get(influencer_id, 0)
+
+    def bump(self, *influencer_ids: Optional[str]):
+        self.version += 1
+        for influencer_id in influencer_ids:
+            if influencer_id is not None:
+                self._influencers[influencer_id] = self.version
+
+    def bump_influencer(self, influencer_id: str):
+        """An influencer profile (name, score, ...) changed"""
+        self.bump(influencer_id)
+        self.influencer_version = self.version
+
+    def on_claim_event(self, event: str, claim, previous=None):
+        """ClaimRepository listener"""
+        self.bump(claim.influencer_id, previous.influencer_id if previous is not None else None)
+
+class CachedResponse:
+    """A serialized JSON body and its ETag"""
+    __slots__ = ("version", "body", "etag")
+
+    def __init__(self, version: Hashable, body: bytes):
+        self.version = version
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+class ResponseCache:
+    """LRU of serialized JSON responses, valid while their data version holds.
+
+    `respond(key, version, build, if_none_match)` only calls `build` when
+    the entry for `key` is missing or was built at another version;
+    otherwise the stored bytes are sent as they are, or a bare 304 when the
+    client already holds the same ETag. The ETag hashes the body, so a
+    rebuild that produces identical JSON still answers 304.
+    """
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> CachedResponse:
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        entry = self._entries[key] = CachedResponse(version, dumps(build()))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def respond(self, key: Hashable, version: Hashable, build: Callable[[], Any], if_none_match: Optional[str] = None) -> Response:
+        entry = self.get(key, version, build)
+        # no-cache: clients may store the body but must revalidate it with the ETag
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if entry.matches(if_none_match):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": self.hits / lookups if lookups else 0,
+            "encoder": "orjson" if orjson is not None else "json"
+        }
@@ -0,0 +1,134 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Window name -> hours covered; None means all time
+WINDOWS = {"24h": 24, "7d": 7 * 24, "30d": 30 * 24, "all": None}
+
+def parse_window(window: str) -> Optional[int]:
+    """Hours covered by a window name ("24h", "7d", "30d"), or None for "all" """
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown window {window!r}, expected one of: {', '.join(WINDOWS)}")
+    return WINDOWS[window]
+
+def hour_of(value: datetime) -> int:
+    """Hours since the proleptic epoch, on the value's own wall clock"""
+    return value.toordinal() * 24 + value.hour
+
+def claim_hour(claim) -> Optional[int]:
+    try:
+        return hour_of(datetime.fromisoformat(claim.date))
+    except (TypeError, ValueError):
+        return None
+
+def _accumulate(target: List[float], values: List[float], sign: int = 1):
+    target[0] += sign * values[0]
+    target[1] += sign * values[1]
+    target[2] += sign * values[2]
+    target[3] += sign * values[3]
+
+def _accumulate_groups(target: Dict[str, List[float]], groups: Dict[str, List[float]], sign: int = 1):
+    for key, values in groups.items():
+        group = target.get(key)
+        if group is None:
+            group = target[key] = [0, 0, 0.0, 0.0]
+        _accumulate(group, values, sign)
+        if group[0] <= 0:
+            del target[key]
+
+class Bucket:
+    """[count, verified, trust_sum, trust_sq_sum] overall, per category and per influencer"""
+    __slots__ = ("totals", "categories", "influencers")
+
+    def __init__(self):
+        self.totals = [0, 0, 0.0, 0.0]
+        self.categories: Dict[str, List[float]] = {}
+        self.influencers: Dict[str, List[float]] = {}
+
+    def add(self, other: "Bucket", sign: int = 1):
+        _accumulate(self.totals, other.totals, sign)
+        _accumulate_groups(self.categories, other.categories, sign)
+        _accumulate_groups(self.influencers, other.influencers, sign)
+
+class RollupSummary(Bucket):
+    """Totals over one window, plus claim counts per day ordinal in `daily`"""
+    __slots__ = ("first_day", "last_day", "daily")
+
+    def __init__(self, first_day: int, last_day: int):
+        super().__init__()
+        self.first_day = first_day
+        self.last_day = last_day
+        self.daily: Dict[int, int] = {}
+
+    def add_bucket(self, day: int, bucket: Bucket):
+        self.add(bucket)
+        self.daily[day] = self.daily.get(day, 0) + bucket.totals[0]
+
+class Rollups:
+    """Hourly and daily claim rollups per category and per influencer.
+
+    Claims land in the bucket of the hour they were made; once an hour is
+    older than `hourly_retention` hours its bucket is folded into the bucket
+    of its day. A window query merges at most `hourly_retention` hourly
+    buckets plus one daily bucket per remaining day, so its cost depends on
+    the window and the number of categories and influencers, not on the
+    number of claims. Window edges older than the hourly retention are
+    rounded to whole days.
+    """
+    def __init__(self, hourly_retention: int = 48):
+        self.hourly_retention = hourly_retention
+        self._hourly: Dict[int, Bucket] = {}
+        self._daily: Dict[int, Bucket] = {}
+        # Hours before the cutoff live in daily buckets, the rest in hourly ones
+        self._cutoff = hour_of(datetime.now()) - hourly_retention + 1
+
+    def __len__(self) -> int:
+        return len(self._hourly) + len(self._daily)
+
+    def add(self, claim, sign: int = 1):
+        """Count a claim in its bucket; `sign=-1` takes it back out"""
+        hour = claim_hour(claim)
+        if hour is None:
+            return
+        self.compact()
+        buckets, key = (self._daily, hour // 24) if hour < self._cutoff else (self._hourly, hour)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = Bucket()
+        trust = claim.trust_score
+        values = [1, claim.verification_status == "Verified", trust, trust * trust]
+        _accumulate(bucket.totals, values, sign)
+        _accumulate_groups(bucket.categories, {claim.category: values}, sign)
+        _accumulate_groups(bucket.influencers, {claim.influencer_id: values}, sign)
+        if bucket.totals[0] <= 0:
+            del buckets[key]
+
+    def compact(self, now: Optional[datetime] = None):
+        """Fold hourly buckets that have aged past the retention into daily ones"""
+        cutoff = hour_of(now or datetime.now()) - self.hourly_retention + 1
+        if cutoff <= self._cutoff:
+            return
+        for hour in [hour for hour in self._hourly if hour < cutoff]:
+            daily = self._daily.get(hour // 24)
+            if daily is None:
+                daily = self._daily[hour // 24] = Bucket()
+            daily.add(self._hourly.pop(hour))
+        self._cutoff = cutoff
+
+    def query(self, hours: int, now: Optional[datetime] = None) -> RollupSummary:
+        """Totals over the last `hours` hours, the current one included"""
+        now = now or datetime.now()
+        self.compact(now)
+        current = hour_of(now)
+        start = current - hours + 1
+        summary = RollupSummary(start // 24, current // 24)
+        for hour, bucket in self._hourly.items():
+            if start <= hour <= current:
+                summary.add_bucket(hour // 24, bucket)
+        if start < self._cutoff:
+            for day, bucket in self._daily.items():
+                if start // 24 <= day <= current // 24:
+                    summary.add_bucket(day, bucket)
+        return summary
+
+    def stats(self) -> Dict:
+        return {"hourly_buckets": len(self._hourly), "daily_buckets": len(self._daily)}
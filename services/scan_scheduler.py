@@ -0,0 +1,151 @@
+import asyncio
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+def posts_report(new: int, skipped: int) -> Dict:
+    """New vs. already-processed post counts for a scan or a sweep"""
+    fetched = new + skipped
+    return {"fetched": fetched, "new": new, "skipped": skipped, "new_ratio": new / fetched if fetched else 0}
+
+class ScanScheduler:
+    """Sweeps many influencers concurrently, one queue per platform.
+
+    Every platform has its own priority queue and workers, so a rate-limited
+    Twitter backlog never holds up YouTube scans. Within a platform the
+    stalest, most-followed influencers go first (seconds since the last scan
+    times log(followers)). The outcome of each scan is kept per influencer in
+    storage, next to the cursor and seen-post ids the scan itself records
+    through `update_state`.
+    """
+    def __init__(
+        self,
+        scan: Callable[[str], Awaitable[Dict]],
+        influencers: Dict[str, Any],
+        storage,
+        platforms: Iterable[str] = ("twitter", "youtube"),
+        concurrency: int = 2
+    ):
+        self.scan = scan
+        self.influencers = influencers
+        self.storage = storage
+        self.concurrency = {
+            platform: int(os.getenv(f"SCAN_{platform.upper()}_CONCURRENCY", str(concurrency)))
+            for platform in platforms
+        }
+        self.states: Dict[str, Dict] = {}
+        self._queues: Dict[str, asyncio.PriorityQueue] = {}
+        self._queued: Set[str] = set()
+        self._running: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        self._seq = 0
+        self.posts_new = 0
+        self.posts_skipped = 0
+        self.last_sweep: Optional[Dict] = None
+
+    def load(self):
+        self.states = dict(self.storage.iter_scan_states())
+
+    def state(self, influencer_id: str) -> Dict:
+        return self.states.get(influencer_id, {})
+
+    def update_state(self, influencer_id: str, **fields) -> Dict:
+        """Merge `fields` into an influencer's scan state and persist it"""
+        state = {**self.state(influencer_id), **fields}
+        self.states[influencer_id] = state
+        self.storage.save_scan_state(influencer_id, state)
+        return state
+
+    def priority(self, influencer, now: float) -> float:
+        staleness = now - self.state(influencer.id).get("last_scanned_at", 0)
+        return staleness * math.log1p(influencer.follower_count)
+
+    def sweep(self, influencer_ids: Optional[Iterable[str]] = None, platform: Optional[str] = None, max_age: float = 0) -> Dict:
+        """Queue influencers for scanning; all of them by default.
+
+        Influencers already queued or running, on unsupported platforms, or
+        scanned less than `max_age` seconds ago are skipped.
+        """
+        now = time.time()
+        queued = {name: 0 for name in self._queues}
+        skipped = 0
+        ids = self.influencers.keys() if influencer_ids is None else influencer_ids
+        for influencer_id in ids:
+            influencer = self.influencers.get(influencer_id)
+            name = influencer.platform.lower() if influencer else None
+            if (
+                name not in self._queues
+                or (platform and name != platform.lower())
+                or influencer_id in self._queued
+                or influencer_id in self._running
+                or now - self.state(influencer_id).get("last_scanned_at", 0) < max_age
+            ):
+                skipped += 1
+                continue
+            self._seq += 1
+            self._queues[name].put_nowait((-self.priority(influencer, now), self._seq, influencer_id))
+            self._queued.add(influencer_id)
+            queued[name] += 1
+        self.last_sweep = {"started_at": now, "queued": queued, "skipped": skipped}
+        return self.last_sweep
+
+    async def start(self):
+        for platform, concurrency in self.concurrency.items():
+            self._queues[platform] = asyncio.PriorityQueue()
+            for _ in range(concurrency):
+                self._workers.append(asyncio.create_task(self._worker(platform)))
+
+    async def _worker(self, platform: str):
+        queue = self._queues[platform]
+        while True:
+            _, _, influencer_id = await queue.get()
+            self._queued.discard(influencer_id)
+            if influencer_id not in self.influencers:
+                continue
+            self._running.add(influencer_id)
+            try:
+                await self._scan_one(influencer_id)
+            finally:
+                self._running.discard(influencer_id)
+
+    async def _scan_one(self, influencer_id: str):
+        started = time.time()
+        try:
+            result = await self.scan(influencer_id)
+            fields = {"last_status": "ok", "last_error": None, "new_claims": len(result.get("claims", []))}
+            posts = result.get("posts") or {}
+            self.posts_new += posts.get("new", 0)
+            self.posts_skipped += posts.get("skipped", 0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            fields = {"last_status": "error", "last_error": getattr(e, "detail", None) or str(e)}
+        # The scan may have stored its own cursor meanwhile, so merge rather than overwrite
+        self.update_state(
+            influencer_id,
+            last_scanned_at=started,
+            scans=self.state(influencer_id).get("scans", 0) + 1,
+            **fields
+        )
+
+    async def run_periodic(self, interval: float, max_age: float = 0):
+        """Start a sweep every `interval` seconds"""
+        while True:
+            self.sweep(max_age=max_age)
+            await asyncio.sleep(interval)
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> Dict:
+        return {
+            "queued": {platform: queue.qsize() for platform, queue in self._queues.items()},
+            "running": len(self._running),
+            "concurrency": dict(self.concurrency),
+            "posts": posts_report(self.posts_new, self.posts_skipped),
+            "last_sweep": self.last_sweep
+        }
@@ -1,10 +1,34 @@
 import asyncio
+import functools
+import threading
 import tweepy
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from services.blocking import BlockingExecutor
+from services.claim_cache import ClaimCache
+
+# tweepy and googleapiclient are synchronous; their calls run on these
+# bounded pools so a scan never blocks the event loop. One pool per platform
+# keeps a stalled Twitter from starving YouTube scans.
+twitter_executor = BlockingExecutor("twitter")
+youtube_executor = BlockingExecutor("youtube")
+
+def _normalize_handle(handle: str) -> str:
+    return handle.replace('@', '').strip().casefold()
+
+def handle_cache(namespace: str) -> ClaimCache:
+    """Handle -> platform id resolutions; ids rarely change, so the TTL is long"""
+    return ClaimCache(
+        namespace,
+        max_entries=int(os.getenv("HANDLE_CACHE_SIZE", "50000")),
+        ttl=float(os.getenv("HANDLE_CACHE_TTL", str(7 * 86400))),
+        path=os.getenv("HANDLE_CACHE_PATH") or os.getenv("ANALYSIS_CACHE_PATH") or None,
+        key_func=_normalize_handle
+    )
 
 class TwitterAPI:
     def __init__(self):
@@ -19,36 +43,56 @@ class TwitterAPI:
         except Exception as e:
             print(f"Twitter API init error: {str(e)}")
             self.client = None
+        self.user_ids = handle_cache("twitter_user_ids")
+
+    async def resolve_user_id(self, username: str) -> Optional[str]:
+        user_id = self.user_ids.get(username)
+        if user_id is None:
+            user_response = await twitter_executor.run(self.client.get_user, username=_normalize_handle(username))
+            if not user_response or not user_response.data:
+                return None
+            user_id = str(user_response.data.id)
+            self.user_ids.set(username, user_id)
+        return user_id
 
     async def fetch_recent_posts(self, username: str, limit: int = 10) -> List[str]:
+        return [post["text"] for post in await self.fetch_posts(username, limit)]
+
+    async def fetch_new_posts(self, username: str, cursor: Optional[str] = None, limit: int = 10) -> Tuple[List[Dict], Optional[str], int]:
+        """Posts newer than `cursor` (a tweet since_id), the cursor for next time and how many were filtered out"""
+        posts = await self.fetch_posts(username, limit, since_id=cursor)
+        ids = [int(post["id"]) for post in posts]
+        if cursor:
+            ids.append(int(cursor))
+        # since_id is applied server-side, so nothing is fetched only to be dropped
+        return posts, str(max(ids)) if ids else None, 0
+
+    async def fetch_posts(self, username: str, limit: int = 10, since_id: Optional[str] = None) -> List[Dict]:
         try:
             if not self.client:
                 return []
             
-            clean_username = username.replace('@', '').strip()
-            
             try:
                 # Add rate limit handling with retry
                 for attempt in range(3):  # Try 3 times
                     try:
-                        user_response = self.client.get_user(username=clean_username)
-                        if not user_response or not user_response.data:
+                        user_id = await self.resolve_user_id(username)
+                        if user_id is None:
                             print(f"User {username} not found")
                             return []
-                            
-                        user_id = user_response.data.id
-                        await asyncio.sleep(1)  # Wait between requests
                         
-                        tweets_response = self.client.get_users_tweets(
+                        tweets_response = await twitter_executor.run(
+                            self.client.get_users_tweets,
                             user_id, 
                             max_results=min(limit, 10),  # Limit to 10 tweets max
-                            exclude=['retweets', 'replies']
+                            exclude=['retweets', 'replies'],
+                            since_id=since_id
                         )
                         
                         if not tweets_response or not tweets_response.data:
                             return []
                             
-                        return [tweet.text for tweet in tweets_response.data]
+                        return [{"id": str(tweet.id), "text": tweet.text} for tweet in tweets_response.data]
                     
                     except tweepy.TooManyRequests:
                         if attempt < 2:  # Don't sleep on last attempt
@@ -72,35 +116,83 @@ class YouTubeAPI:
     def __init__(self):
         self.api_key = os.getenv("YOUTUBE_API_KEY")
         self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+        self._local = threading.local()
+        self.uploads_playlists = handle_cache("youtube_uploads_playlists")
+
+    def _execute(self, request):
+        # httplib2 connections are not thread-safe: give each pool thread its own
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = build_http()
+        return request.execute(http=http)
 
     async def fetch_recent_posts(self, channel_name: str, limit: int = 10) -> List[str]:
-        try:
-            # First get channel ID
+        return [post["text"] for post in await self.fetch_posts(channel_name, limit)]
+
+    async def fetch_new_posts(self, channel_name: str, cursor: Optional[str] = None, limit: int = 10) -> Tuple[List[Dict], Optional[str], int]:
+        """Videos published after `cursor` (an RFC 3339 timestamp), the cursor for next time and how many were filtered out"""
+        fetched = await self.fetch_posts(channel_name, limit)
+        # playlistItems has no publishedAfter filter, so older uploads are dropped here;
+        # RFC 3339 timestamps from the API sort correctly as strings
+        posts = [
+            post for post in fetched
+            if not (cursor and post.get("published_at") and post["published_at"] <= cursor)
+        ]
+        stamps = [post["published_at"] for post in posts if post.get("published_at")]
+        if cursor:
+            stamps.append(cursor)
+        return posts, max(stamps) if stamps else None, len(fetched) - len(posts)
+
+    async def resolve_uploads_playlist(self, channel_name: str) -> Optional[str]:
+        """Uploads playlist of a channel, cached; a miss costs 1 quota unit, or 101 via search"""
+        playlist_id = self.uploads_playlists.get(channel_name)
+        if playlist_id is not None:
+            return playlist_id
+
+        request = self.youtube.channels().list(part="contentDetails", forUsername=_normalize_handle(channel_name))
+        response = await youtube_executor.run(self._execute, request)
+        if not response.get('items'):
             request = self.youtube.search().list(
                 part="snippet",
                 q=channel_name,
                 type="channel",
                 maxResults=1
             )
-            response = request.execute()
-            
-            if not response['items']:
+            response = await youtube_executor.run(self._execute, request)
+            if not response.get('items'):
+                return None
+            request = self.youtube.channels().list(part="contentDetails", id=response['items'][0]['id']['channelId'])
+            response = await youtube_executor.run(self._execute, request)
+            if not response.get('items'):
+                return None
+
+        playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        self.uploads_playlists.set(channel_name, playlist_id)
+        return playlist_id
+
+    async def fetch_posts(self, channel_name: str, limit: int = 10) -> List[Dict]:
+        try:
+            playlist_id = await self.resolve_uploads_playlist(channel_name)
+            if playlist_id is None:
                 return []
-                
-            channel_id = response['items'][0]['id']['channelId']
             
-            # Get recent videos
-            request = self.youtube.search().list(
-                part="snippet",
-                channelId=channel_id,
-                order="date",
-                type="video",
+            # Recent uploads, newest first: 1 quota unit instead of 100 for search.list
+            request = self.youtube.playlistItems().list(
+                part="snippet,contentDetails",
+                playlistId=playlist_id,
                 maxResults=limit
             )
-            response = request.execute()
+            response = await youtube_executor.run(self._execute, request)
             
-            # Get video descriptions
-            return [item['snippet']['description'] for item in response.get('items', [])]
+            posts = []
+            for item in response.get('items', []):
+                published_at = item['contentDetails'].get('videoPublishedAt') or item['snippet'].get('publishedAt')
+                posts.append({
+                    "id": item['contentDetails'].get('videoId'),
+                    "text": item['snippet']['description'],
+                    "published_at": published_at
+                })
+            return posts
             
         except HttpError as e:
             print(f"YouTube API error: {str(e)}")
@@ -109,3 +201,12 @@ class YouTubeAPI:
             print(f"Error fetching YouTube content: {str(e)}")
             return []
 
+@functools.lru_cache(maxsize=None)
+def get_twitter_api() -> TwitterAPI:
+    """Process-wide TwitterAPI, so the tweepy client and id cache are built once"""
+    return TwitterAPI()
+
+@functools.lru_cache(maxsize=None)
+def get_youtube_api() -> YouTubeAPI:
+    """Process-wide YouTubeAPI, so the discovery document is loaded once"""
+    return YouTubeAPI()
@@ -0,0 +1,341 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+CLAIM_COLUMNS = ("id", "influencer_id", "content", "category", "verification_status", "trust_score", "source", "date")
+INFLUENCER_COLUMNS = ("id", "name", "follower_count", "trust_score", "platform")
+
+def to_row(model) -> Dict:
+    """Plain dict of a pydantic model (v1 or v2)"""
+    dump = getattr(model, "model_dump", None) or model.dict
+    return dump()
+
+class Storage:
+    """Durable store behind the in-memory claim and influencer maps.
+
+    The app reads from memory and writes through to a Storage; on startup
+    it streams rows back in instead of re-running analysis.
+    """
+    def save_influencer(self, influencer: Dict):
+        pass
+
+    def save_claims(self, claims: Iterable[Dict]):
+        pass
+
+    def delete_claim(self, claim_id: str):
+        pass
+
+    def iter_influencers(self) -> Iterator[Dict]:
+        return iter(())
+
+    def iter_claims(self) -> Iterator[Dict]:
+        return iter(())
+
+    def iter_claim_chunks(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        chunk_size: int = 10000
+    ) -> Iterator[List[tuple]]:
+        """Stored claims as tuples in CLAIM_COLUMNS order, `chunk_size` rows at a time"""
+        return iter(())
+
+    def save_scan_state(self, influencer_id: str, state: Dict):
+        pass
+
+    def iter_scan_states(self) -> Iterator[Tuple[str, Dict]]:
+        return iter(())
+
+    def reserve_ids(self, name: str, count: int) -> int:
+        """Reserve `count` consecutive ids for table `name`; returns the first"""
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class MemoryStorage(Storage):
+    """No persistence; every start is a cold start with sample data"""
+    def __init__(self):
+        self._sequences: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reserve_ids(self, name: str, count: int) -> int:
+        with self._lock:
+            start = self._sequences.get(name, 1)
+            self._sequences[name] = start + count
+            return start
+
+class SQLiteStorage(Storage):
+    """SQLite (WAL) storage with buffered, batched claim writes.
+
+    Claim writes are queued and flushed with one executemany per
+    `batch_size` rows (or on `flush()`), reusing sqlite3's cached prepared
+    statements. Influencer writes are rare and go straight to disk.
+    """
+    _UPSERT_CLAIM = (
+        f"INSERT OR REPLACE INTO claims ({', '.join(CLAIM_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in CLAIM_COLUMNS)})"
+    )
+    _INSERT_NEW_CLAIM = (
+        f"INSERT OR IGNORE INTO claims ({', '.join(CLAIM_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in CLAIM_COLUMNS)})"
+    )
+    _UPSERT_INFLUENCER = (
+        f"INSERT OR REPLACE INTO influencers ({', '.join(INFLUENCER_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in INFLUENCER_COLUMNS)})"
+    )
+    _INDEXES = {
+        "idx_claims_influencer": "CREATE INDEX IF NOT EXISTS idx_claims_influencer ON claims (influencer_id)",
+        "idx_claims_category": "CREATE INDEX IF NOT EXISTS idx_claims_category ON claims (category)",
+        "idx_claims_date": "CREATE INDEX IF NOT EXISTS idx_claims_date ON claims (date)"
+    }
+
+    def __init__(self, path: str, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: List[tuple] = []
+        self._lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS influencers ("
+            "id TEXT PRIMARY KEY, name TEXT NOT NULL, follower_count INTEGER NOT NULL, "
+            "trust_score REAL NOT NULL, platform TEXT NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS claims ("
+            "id TEXT PRIMARY KEY, influencer_id TEXT NOT NULL, content TEXT NOT NULL, "
+            "category TEXT NOT NULL, verification_status TEXT NOT NULL, trust_score REAL NOT NULL, "
+            "source TEXT NOT NULL, date TEXT NOT NULL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS scan_state (influencer_id TEXT PRIMARY KEY, state TEXT NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS id_sequences (name TEXT PRIMARY KEY, next_value INTEGER NOT NULL)")
+        for statement in self._INDEXES.values():
+            self.db.execute(statement)
+
+    def reserve_ids(self, name: str, count: int) -> int:
+        if name not in ("claims", "influencers"):
+            raise ValueError(f"Unknown id sequence: {name}")
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so workers sharing
+            # the database file never hand out the same block
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute("SELECT next_value FROM id_sequences WHERE name = ?", (name,)).fetchone()
+                start = row[0] if row else self._max_id(name) + 1
+                self.db.execute(
+                    "INSERT OR REPLACE INTO id_sequences (name, next_value) VALUES (?, ?)", (name, start + count)
+                )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+            return start
+
+    def _max_id(self, table: str) -> int:
+        row = self.db.execute(f"SELECT MAX(CAST(id AS INTEGER)) FROM {table}").fetchone()
+        return row[0] or 0
+
+    def save_influencer(self, influencer: Dict):
+        with self._lock:
+            self.db.execute(self._UPSERT_INFLUENCER, tuple(influencer[c] for c in INFLUENCER_COLUMNS))
+
+    def save_claims(self, claims: Iterable[Dict]):
+        with self._lock:
+            self._pending.extend(tuple(claim[c] for c in CLAIM_COLUMNS) for claim in claims)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def delete_claim(self, claim_id: str):
+        with self._lock:
+            self.flush()
+            self.db.execute("DELETE FROM claims WHERE id = ?", (claim_id,))
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            self.db.execute("BEGIN")
+            try:
+                self.db.executemany(self._UPSERT_CLAIM, rows)
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                self._pending = rows + self._pending
+                raise
+
+    def save_scan_state(self, influencer_id: str, state: Dict):
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO scan_state (influencer_id, state) VALUES (?, ?)",
+                (influencer_id, json.dumps(state))
+            )
+
+    def iter_scan_states(self) -> Iterator[Tuple[str, Dict]]:
+        for row in self._stream("SELECT influencer_id, state FROM scan_state", ("influencer_id", "state")):
+            yield row["influencer_id"], json.loads(row["state"])
+
+    def _stream_chunks(self, query: str, params=(), chunk_size: int = 10000) -> Iterator[List[tuple]]:
+        # A separate read connection keeps streaming independent of pending writes
+        reader = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            cursor = reader.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            reader.close()
+
+    def _stream(self, query: str, columns, params=(), chunk_size: int = 10000) -> Iterator[Dict]:
+        for rows in self._stream_chunks(query, params, chunk_size):
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def iter_influencers(self) -> Iterator[Dict]:
+        self.flush()
+        return self._stream(f"SELECT {', '.join(INFLUENCER_COLUMNS)} FROM influencers ORDER BY rowid", INFLUENCER_COLUMNS)
+
+    def iter_claims(self) -> Iterator[Dict]:
+        self.flush()
+        return self._stream(f"SELECT {', '.join(CLAIM_COLUMNS)} FROM claims ORDER BY rowid", CLAIM_COLUMNS)
+
+    def iter_claim_chunks(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        chunk_size: int = 10000
+    ) -> Iterator[List[tuple]]:
+        # No ORDER BY: sorting a filtered export would buffer every match in a temp b-tree
+        conditions, params = [], []
+        if date_from:
+            conditions.append("date >= ?")
+            params.append(date_from)
+        if date_to:
+            # date_to="2024-01-31" includes that whole day
+            conditions.append("date < ?")
+            params.append(date_to + "\uffff")
+        if categories:
+            conditions.append(f"category IN ({', '.join('?' for _ in categories)})")
+            params.extend(categories)
+        query = f"SELECT {', '.join(CLAIM_COLUMNS)} FROM claims"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        self.flush()
+        return self._stream_chunks(query, params, chunk_size)
+
+    def bulk_import_claims(
+        self,
+        lines: TextIO,
+        batch_size: int = 50000,
+        rebuild_indexes: bool = True,
+        keep_ids: bool = False
+    ) -> Dict:
+        """Load historical claims from JSONL, one claim object per line.
+
+        Imported claims get fresh ids from the claims sequence, so they can
+        never overwrite stored claims or take ids a running server has
+        already reserved. With `keep_ids` the file's ids are kept and rows
+        whose id is already stored are left out and counted as conflicts.
+
+        Secondary indexes are dropped during the load and rebuilt once at
+        the end, which is much faster than maintaining them row by row.
+        """
+        imported = skipped = conflicts = 0
+        batch = []
+        with self._lock:
+            self.flush()
+            if rebuild_indexes:
+                for name in self._INDEXES:
+                    self.db.execute(f"DROP INDEX IF EXISTS {name}")
+            try:
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        claim = json.loads(line)
+                        batch.append(tuple(claim[c] for c in CLAIM_COLUMNS))
+                    except (ValueError, KeyError, TypeError):
+                        skipped += 1
+                        continue
+                    if len(batch) >= batch_size:
+                        inserted = self._insert_batch(batch, keep_ids)
+                        imported += inserted
+                        conflicts += len(batch) - inserted
+                        batch = []
+                if batch:
+                    inserted = self._insert_batch(batch, keep_ids)
+                    imported += inserted
+                    conflicts += len(batch) - inserted
+            finally:
+                for statement in self._INDEXES.values():
+                    self.db.execute(statement)
+            # Keep newly allocated ids above anything that was imported
+            self.db.execute(
+                "UPDATE id_sequences SET next_value = MAX(next_value, ?) WHERE name = 'claims'",
+                (self._max_id("claims") + 1,)
+            )
+        return {"imported": imported, "skipped": skipped, "conflicts": conflicts}
+
+    def _insert_batch(self, rows: List[tuple], keep_ids: bool) -> int:
+        """Insert one batch in a transaction; returns how many rows were inserted"""
+        if not keep_ids:
+            start = self.reserve_ids("claims", len(rows))
+            rows = [(str(start + i), *row[1:]) for i, row in enumerate(rows)]
+        self.db.execute("BEGIN")
+        try:
+            inserted = self.db.executemany(self._INSERT_NEW_CLAIM, rows).rowcount
+            self.db.execute("COMMIT")
+            return inserted
+        except Exception:
+            # Leave the shared connection usable for later flushes
+            self.db.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self.db.close()
+
+class IdAllocator:
+    """Atomic, monotonic numeric ids handed out from blocks reserved in storage.
+
+    Reserving `block_size` ids per storage round-trip keeps allocation
+    cheap; the reservation itself is atomic across processes, so ids never
+    collide even with several workers on one database.
+    """
+    def __init__(self, storage: Storage, name: str, block_size: int = 100):
+        self.storage = storage
+        self.name = name
+        self.block_size = block_size
+        self._next = 0
+        self._limit = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        with self._lock:
+            if self._next >= self._limit:
+                self._next = self.storage.reserve_ids(self.name, self.block_size)
+                self._limit = self._next + self.block_size
+            value = self._next
+            self._next += 1
+        return str(value)
+
+def storage_from_env() -> Storage:
+    """SQLite at STORAGE_PATH unless STORAGE_BACKEND=memory"""
+    if os.getenv("STORAGE_BACKEND", "sqlite") == "memory":
+        return MemoryStorage()
+    return SQLiteStorage(
+        os.getenv("STORAGE_PATH", "claims.db"),
+        batch_size=int(os.getenv("STORAGE_BATCH_SIZE", "500"))
+    )
@@ -0,0 +1,247 @@
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+import httpx
+
+# Status codes that mean "slow down" rather than "this request is wrong"
+OVERLOAD_STATUSES = (429, 503)
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `burst`"""
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        # The lock keeps waiters in FIFO order instead of racing for each token
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+class AdaptiveLimiter:
+    """Concurrency limit that follows upstream capacity (AIMD).
+
+    Every successful call below `target_latency` grows the limit by
+    1/limit, i.e. about one extra slot per round of calls. A throttled call
+    (429/503, timeout) or one slower than `target_latency` halves it; calls
+    that started before the last decrease don't halve it again, so one
+    overloaded window only counts once.
+    """
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        target_latency: float = 5.0
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self.throttled = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> float:
+        """Wait for a free slot; returns the start time to pass to release"""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken and cancelled at once: pass the free slot on
+                    self._wake()
+                raise
+        self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, overloaded: bool, failed: bool = False):
+        """Free a slot; `failed` calls (other errors) leave the limit alone"""
+        self.in_flight -= 1
+        if overloaded:
+            self.throttled += 1
+        now = time.monotonic()
+        if overloaded or (not failed and now - started > self.target_latency):
+            if started >= self._last_decrease:
+                self.limit = max(self.min_limit, self.limit / 2)
+                self._last_decrease = now
+        elif not failed:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+class CircuitBreaker:
+    """Stops calling an upstream after `failure_threshold` failures in a row.
+
+    Once open, calls fail fast until `reset_timeout` seconds have passed;
+    then a single trial call is let through (half-open) and its outcome
+    closes the circuit again or re-opens it.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._trial or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial:
+            self._trial = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record(self, success: bool):
+        self._trial = False
+        if success:
+            self.failures = 0
+            self.opened_at = None
+        else:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """Give back a trial slot without a verdict (the call was cancelled)"""
+        self._trial = False
+
+class Upstream:
+    """Rate limit, adaptive concurrency and a circuit breaker for one upstream.
+
+    `call(fn)` fails fast with CircuitOpenError while the breaker is open,
+    otherwise waits for a token and a concurrency slot, runs `fn()` and
+    feeds the outcome back: responses with a 429/503 status and timeouts
+    shrink the window and fast successes grow it; timeouts, other errors
+    and 5xx responses count against the breaker, throttling alone doesn't.
+    """
+    def __init__(
+        self,
+        name: str,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        limiter: AdaptiveLimiter = None,
+        breaker: CircuitBreaker = None
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = limiter or AdaptiveLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls, name: str, rate: float = 10.0, max_concurrency: int = 64) -> "Upstream":
+        """Configured by <NAME>_RATE_LIMIT, _BURST, _MAX_CONCURRENCY, _TARGET_LATENCY,
+        _BREAKER_THRESHOLD and _BREAKER_RESET"""
+        prefix = name.upper()
+        rate = float(os.getenv(f"{prefix}_RATE_LIMIT", str(rate)))
+        burst = os.getenv(f"{prefix}_BURST")
+        return cls(
+            name,
+            rate=rate,
+            burst=float(burst) if burst else None,
+            limiter=AdaptiveLimiter(
+                max_limit=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(max_concurrency))),
+                target_latency=float(os.getenv(f"{prefix}_TARGET_LATENCY", "5.0"))
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv(f"{prefix}_BREAKER_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv(f"{prefix}_BREAKER_RESET", "30"))
+            )
+        )
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for a call whose outcome is reported via the yielded dict"""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        outcome = {"overloaded": False, "failed": False, "cancelled": False}
+        try:
+            await self.bucket.acquire()
+            started = await self.limiter.acquire()
+        except BaseException:
+            self.breaker.release()
+            raise
+        if self.breaker.state == "open":
+            # Opened while this call waited for a slot: fail fast instead of piling on
+            self.limiter.release(started, overloaded=False, failed=True)
+            self.breaker.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        try:
+            yield outcome
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            # Shrinks the window like a 429 and also counts against the breaker
+            outcome["overloaded"] = outcome["failed"] = True
+            raise
+        except asyncio.CancelledError:
+            outcome["cancelled"] = True
+            raise
+        except BaseException:
+            outcome["failed"] = True
+            raise
+        finally:
+            self.calls += 1
+            self.limiter.release(started, outcome["overloaded"], outcome["failed"] or outcome["cancelled"])
+            if outcome["cancelled"]:
+                self.breaker.release()
+            else:
+                self.breaker.record(not outcome["failed"])
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        async with self.slot() as outcome:
+            result = await fn()
+            status = getattr(result, "status_code", None)
+            outcome["overloaded"] = status in OVERLOAD_STATUSES
+            outcome["failed"] = status is not None and status >= 500 and not outcome["overloaded"]
+            return result
+
+    def stats(self) -> Dict:
+        return {
+            "rate_limit": self.bucket.rate,
+            "concurrency_limit": int(self.limiter.limit),
+            "in_flight": self.limiter.in_flight,
+            "calls": self.calls,
+            "throttled": self.limiter.throttled,
+            "circuit": self.breaker.state,
+            "rejected": self.breaker.rejected
+        }
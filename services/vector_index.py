@@ -0,0 +1,266 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+class VectorIndex:
+    """Approximate nearest-neighbour index over normalized claim embeddings.
+
+    Below `train_threshold` vectors every query is an exact dot product over
+    the whole matrix. Past it the index trains a spherical k-means coarse
+    quantizer (IVF) and a query only scores the rows in its `nprobe` nearest
+    lists; new vectors are assigned to a list as they arrive, and the
+    quantizer is retrained whenever the index has grown fourfold.
+
+    With `path` set, vectors, claim ids and list assignments are appended to
+    `<path>.f32`, `<path>.ids.jsonl` and `<path>.lists.i32`; on startup the
+    vectors are memory-mapped instead of being re-encoded.
+    """
+    def __init__(
+        self,
+        dim: Optional[int] = None,
+        path: Optional[str] = None,
+        nprobe: int = 8,
+        train_threshold: int = 4096,
+        seed: int = 1
+    ):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.seed = seed
+
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._base = None
+        self._tail = None
+        self._tail_count = 0
+        self._centroids = None
+        self._lists: List[np.ndarray] = []
+        self._list_sizes = None
+        self._trained_at = 0
+
+        self.path = path
+        self._files = None
+        if path and os.path.exists(f"{path}.meta.json"):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, claim_id: str) -> bool:
+        return claim_id in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def _base_count(self) -> int:
+        return 0 if self._base is None else len(self._base)
+
+    def _row(self, row: int) -> np.ndarray:
+        base = self._base_count()
+        return self._base[row] if row < base else self._tail[row - base]
+
+    def _gather(self, rows: np.ndarray) -> np.ndarray:
+        base = self._base_count()
+        if not base:
+            return self._tail[rows]
+        if not self._tail_count:
+            return self._base[rows]
+        in_base = rows < base
+        out = np.empty((len(rows), self.dim), dtype=np.float32)
+        out[in_base] = self._base[rows[in_base]]
+        out[~in_base] = self._tail[rows[~in_base] - base]
+        return out
+
+    def _segments(self):
+        if self._base_count():
+            yield 0, self._base
+        if self._tail_count:
+            yield self._base_count(), self._tail[:self._tail_count]
+
+    def vector(self, claim_id: str) -> Optional[np.ndarray]:
+        row = self._rows.get(claim_id)
+        return None if row is None else np.asarray(self._row(row))
+
+    def add(self, claim_id: str, vector: np.ndarray):
+        self.add_many([claim_id], vector[None, :])
+
+    def add_many(self, claim_ids: Iterable[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        fresh = [(i, claim_id) for i, claim_id in enumerate(claim_ids) if claim_id not in self._rows]
+        if not fresh:
+            return
+        vectors = vectors[[i for i, _ in fresh]]
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        if self._tail is None:
+            self._tail = np.empty((max(1024, len(vectors)), self.dim), dtype=np.float32)
+        if self._tail_count + len(vectors) > len(self._tail):
+            self._tail = np.resize(self._tail, (max(len(self._tail) * 2, self._tail_count + len(vectors)), self.dim))
+
+        start = len(self._ids)
+        self._tail[self._tail_count:self._tail_count + len(vectors)] = vectors
+        self._tail_count += len(vectors)
+        for offset, (_, claim_id) in enumerate(fresh):
+            self._ids.append(claim_id)
+            self._rows[claim_id] = start + offset
+
+        assignments = None
+        if self.trained:
+            assignments = np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+            for offset, cell in enumerate(assignments):
+                self._list_append(cell, start + offset)
+
+        if self.path:
+            self._append(fresh, vectors, assignments)
+
+        if len(self._ids) >= self.train_threshold and len(self._ids) >= 4 * self._trained_at:
+            self.train()
+
+    def train(self, iterations: int = 10):
+        """(Re)build the coarse quantizer over all stored vectors"""
+        count = len(self._ids)
+        nlist = max(1, int(np.sqrt(count)))
+        rng = np.random.RandomState(self.seed)
+        sample = self._gather(np.sort(rng.choice(count, size=min(count, nlist * 64), replace=False)))
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for cell in range(nlist):
+                members = sample[labels == cell]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[cell] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        self._centroids = centroids
+        assignments = np.empty(count, dtype=np.int32)
+        for offset, segment in self._segments():
+            for chunk in range(0, len(segment), 65536):
+                block = np.asarray(segment[chunk:chunk + 65536])
+                assignments[offset + chunk:offset + chunk + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        self._build_lists(assignments)
+        self._trained_at = count
+
+        if self.path:
+            np.save(f"{self.path}.centroids.npy", centroids)
+            self._close_files()
+            assignments.tofile(f"{self.path}.lists.i32")
+            self._write_meta()
+            self._open_files()
+
+    def _build_lists(self, assignments: np.ndarray):
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]].copy() for i in range(len(self._centroids))]
+        self._list_sizes = np.diff(bounds)
+
+    def _list_append(self, cell: int, row: int):
+        size = self._list_sizes[cell]
+        if size == len(self._lists[cell]):
+            self._lists[cell] = np.resize(self._lists[cell], max(16, size * 2))
+        self._lists[cell][size] = row
+        self._list_sizes[cell] = size + 1
+
+    def search(self, vector: np.ndarray, k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Top-k (claim_id, cosine similarity) pairs, best first"""
+        if not self._ids:
+            return []
+        vector = np.asarray(vector, dtype=np.float32)
+        exclude = set(exclude)
+
+        if self.trained:
+            probe = np.argsort(-(self._centroids @ vector))[:self.nprobe]
+            rows = np.concatenate([self._lists[cell][:self._list_sizes[cell]] for cell in probe])
+            if not len(rows):
+                return []
+            scores = self._gather(rows) @ vector
+        else:
+            rows = np.arange(len(self._ids))
+            scores = np.concatenate([np.asarray(segment) @ vector for _, segment in self._segments()])
+
+        wanted = min(len(scores), k + len(exclude))
+        top = np.argpartition(-scores, wanted - 1)[:wanted]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for i in top:
+            claim_id = self._ids[rows[i]]
+            if claim_id not in exclude:
+                results.append((claim_id, float(scores[i])))
+            if len(results) == k:
+                break
+        return results
+
+    def neighbours(self, claim_id: str, k: int = 10) -> List[Tuple[str, float]]:
+        vector = self.vector(claim_id)
+        return [] if vector is None else self.search(vector, k, exclude=[claim_id])
+
+    def _write_meta(self):
+        with open(f"{self.path}.meta.json", "w") as f:
+            json.dump({"dim": self.dim, "trained_at": self._trained_at}, f)
+
+    def _open_files(self):
+        self._files = (
+            open(f"{self.path}.f32", "ab"),
+            open(f"{self.path}.ids.jsonl", "a"),
+            open(f"{self.path}.lists.i32", "ab")
+        )
+
+    def _close_files(self):
+        if self._files:
+            for f in self._files:
+                f.close()
+        self._files = None
+
+    def _append(self, fresh, vectors: np.ndarray, assignments: Optional[np.ndarray]):
+        if self._files is None:
+            self._write_meta()
+            self._open_files()
+        vector_file, id_file, list_file = self._files
+        vector_file.write(vectors.tobytes())
+        id_file.writelines(json.dumps(claim_id) + "\n" for _, claim_id in fresh)
+        if assignments is not None:
+            list_file.write(assignments.tobytes())
+        for f in self._files:
+            f.flush()
+
+    def _load(self, path: str):
+        with open(f"{path}.meta.json") as f:
+            meta = json.load(f)
+        self.dim = meta["dim"]
+        self._trained_at = meta.get("trained_at", 0)
+
+        ids = []
+        with open(f"{path}.ids.jsonl") as f:
+            for line in f:
+                if line.endswith("\n"):
+                    ids.append(json.loads(line))
+        rows = os.path.getsize(f"{path}.f32") // (4 * self.dim)
+        count = min(len(ids), rows)
+        if count < len(ids) or count < rows:
+            # Cut short by a crash between the two writes: keep the common prefix
+            os.truncate(f"{path}.f32", count * 4 * self.dim)
+            with open(f"{path}.ids.jsonl", "w") as f:
+                f.writelines(json.dumps(claim_id) + "\n" for claim_id in ids[:count])
+        self._ids = ids[:count]
+        self._rows = {claim_id: row for row, claim_id in enumerate(self._ids)}
+        if count:
+            self._base = np.memmap(f"{path}.f32", dtype=np.float32, mode="r", shape=(count, self.dim))
+
+        if self._trained_at and os.path.exists(f"{path}.centroids.npy"):
+            self._centroids = np.load(f"{path}.centroids.npy")
+            lists_path = f"{path}.lists.i32"
+            assignments = np.fromfile(lists_path, dtype=np.int32)[:count]
+            os.truncate(lists_path, len(assignments) * 4)
+            if len(assignments) < count:
+                missing = np.argmax(self._gather(np.arange(len(assignments), count)) @ self._centroids.T, axis=1)
+                assignments = np.concatenate([assignments, missing.astype(np.int32)])
+                with open(lists_path, "ab") as f:
+                    f.write(missing.astype(np.int32).tobytes())
+            self._build_lists(assignments)
+
+        self._open_files()
+
+    def close(self):
+        self._close_files()